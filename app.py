@@ -1,7 +1,13 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
-import ast
 import plotly.express as px
+import sqlite3
+from cubo import TODOS, construir_cubo, agregar_celula, salvar_cubo, carregar_cubo, indexar_cubo, cubo_desatualizado
+from busca import abrir_indice, atualizar_indice, buscar, ids_da_busca, id_da_vaga
+from skills import SkillsCompactas
+from descricoes import ArquivoDescricoes
+from tendencias import atualizar_tendencias, carregar_tendencias, salvar_tendencias, carregar_vistas, salvar_vistas, tendencias_desatualizadas, serie
 
 # 1. Configuração da Página
 st.set_page_config(page_title="Job Hunter Skills", layout="wide", page_icon="💼")
@@ -16,161 +22,182 @@ st.title("💼 Job Hunter AI: Análise de Mercado Tech")
 st.markdown("Descubra as tecnologias e skills mais pedidas nas vagas do LinkedIn.")
 
 # 2. Carregar Dados
-@st.cache_data
+ARQUIVO_CSV = 'dados_vagas_linkedin.csv'
+LIMITE_TABELA = 1000  # Linhas exibidas na lista de vagas (métricas e gráficos usam todas)
+
+@st.cache_resource
 def load_data():
+    """DataFrame das vagas e as skills (tech_stack com cloud, e cloud) já no formato compacto.
+
+    As colunas de texto das skills ("['Python', 'SQL']") são convertidas uma vez por processo do
+    servidor e removidas do DataFrame: o dashboard só usa os arrays de ids de SkillsCompactas.
+    """
     try:
-        df = pd.read_csv('dados_vagas_linkedin.csv')
-        # Garante colunas mínimas
-        cols_obrigatorias = ['cargo_simplificado', 'senioridade_simplificada', 'tipo_padronizado']
-        for col in cols_obrigatorias:
-            if col not in df.columns:
-                df[col] = 'N/A'
-        return df
+        df = pd.read_csv(ARQUIVO_CSV)
     except FileNotFoundError:
-        return pd.DataFrame()
+        return pd.DataFrame(), None, None
+    # Garante colunas mínimas
+    cols_obrigatorias = ['cargo_simplificado', 'senioridade_simplificada', 'tipo_padronizado']
+    for col in cols_obrigatorias:
+        if col not in df.columns:
+            df[col] = 'N/A'
+    for col in ['tech_stack', 'cloud']:
+        if col not in df.columns:
+            df[col] = None
+    df['id_vaga'] = df['link'].map(id_da_vaga)
+    tech, cloud = SkillsCompactas.de_coluna(df['tech_stack']), SkillsCompactas.de_coluna(df['cloud'])
+    return df.drop(columns=['tech_stack', 'cloud']), tech, cloud
 
-df_raw = load_data()
+# 3. Skills em formato compacto (vocabulário + arrays de ids), convertidas uma vez por sessão do servidor
+df_raw, tech_raw, cloud_raw = load_data()
 
 if df_raw.empty:
     st.warning("⚠️ Nenhum dado encontrado. Suba o arquivo 'dados_vagas_linkedin.csv'.")
     st.stop()
 
-# 4. Limpeza e Conversão
-def limpar_lista(item):
+# Cubo de agregados (métricas e gráficos saem de uma consulta ao dicionário)
+@st.cache_data
+def load_cubo():
+    if not cubo_desatualizado(ARQUIVO_CSV):
+        return carregar_cubo()
+    # Cubo ausente ou mais antigo que o CSV: reconstrói (e tenta salvar para as próximas execuções)
+    cubo = construir_cubo(df_raw, tech_raw, cloud_raw)
+    try: salvar_cubo(cubo)
+    except OSError: pass
+    return indexar_cubo(cubo)
+
+cubo = load_cubo()
+
+# 4. Rollups diários por data_coleta (tendências) - só os dias novos/alterados são agregados
+@st.cache_data
+def load_tendencias():
+    tendencias = carregar_tendencias()
+    if tendencias_desatualizadas(ARQUIVO_CSV):
+        # O mapa de vagas vistas só é lido quando há linhas novas para agregar
+        vistas = carregar_vistas()
+        atualizar_tendencias(df_raw, tendencias, vistas, tech=tech_raw)
+        try:
+            salvar_tendencias(tendencias)
+            salvar_vistas(vistas)
+        except OSError: pass
+    return tendencias
+
+# 5. Índice de busca textual (FTS5) - atualizado incrementalmente com as vagas novas do CSV
+@st.cache_resource
+def load_indice():
     try:
-        if pd.isna(item) or item == 'N/A' or item == '[]': return []
-        return ast.literal_eval(item)
-    except: return []
-
-if 'tech_stack' in df_raw.columns:
-    df_raw['tech_stack_lista'] = df_raw['tech_stack'].apply(limpar_lista)
-# Cloud ainda existe separado, mas Tech Stack agora engloba tudo
-if 'cloud' in df_raw.columns:
-    df_raw['cloud_lista'] = df_raw['cloud'].apply(limpar_lista)
-
-# --- NORMALIZAÇÃO E EXPANSÃO DE SKILLS ---
-def normalizar_techs(lista_techs):
-    if not isinstance(lista_techs, list): return []
-    nova_lista = []
-    
-    # Mapa de EXPANSÃO (1 skill vira várias)
-    # Ex: 'Azure Databricks' -> Conta como Azure e como Databricks
-    mapa_expansao = {
-        'azure databricks': ['Azure', 'Databricks'],
-        'azure sql': ['Azure', 'SQL', 'Azure SQL'],
-        'azure sql database': ['Azure', 'SQL', 'Azure SQL'],
-        'aws glue': ['AWS', 'Glue'],
-        'aws lambda': ['AWS', 'Lambda'],
-        'google bigquery': ['GCP', 'BigQuery'],
-        'bigquery': ['GCP', 'BigQuery']
-    }
-
-    # Mapa de SUBSTITUIÇÃO SIMPLES (Padronização)
-    mapa_substituicao = {
-        'data bricks': 'Databricks',
-        'powerbi': 'Power BI',
-        'microsoft power bi': 'Power BI',
-        'sql server': 'SQL',
-        'transact-sql': 'SQL',
-        't-sql': 'SQL',
-        'amazon web services': 'AWS',
-        'gcp': 'GCP',
-        'google cloud platform': 'GCP',
-        'google cloud': 'GCP',
-        'azure': 'Microsoft Azure', # Padroniza nome da cloud
-        'microsoft azure': 'Microsoft Azure',
-        'excel': 'Excel',
-        'ms excel': 'Excel'
-    }
-
-    for tech in lista_techs:
-        tech_lower = tech.strip().lower()
-        
-        # 1. Verifica se deve expandir
-        if tech_lower in mapa_expansao:
-            nova_lista.extend(mapa_expansao[tech_lower])
-        
-        # 2. Verifica se deve substituir
-        elif tech_lower in mapa_substituicao:
-            nova_lista.append(mapa_substituicao[tech_lower])
-            
-        # 3. Mantém original se não houver regra
-        else:
-            nova_lista.append(tech)
-    
-    # Remove duplicatas finais (Ex: se já tinha Azure e adicionou Azure de novo)
-    return list(set(nova_lista))
+        con = abrir_indice()
+    except sqlite3.OperationalError:
+        con = abrir_indice(':memory:')  # Disco somente leitura: mantém o índice em memória
+    # CSV migrado (sem descricao_raw): as descrições saem do armazém comprimido
+    atualizar_indice(con, df_raw, ArquivoDescricoes())
+    return con
+
+# Os recortes abaixo são arrays de posições em df_raw, compartilhados entre as sessões (só leitura)
+@st.cache_resource
+def linhas_da_busca(texto, skills):
+    """Posições das vagas da busca textual que pedem todas as `skills`, as mais relevantes primeiro"""
+    mascara = np.ones(len(df_raw), dtype=bool)
+    ranking = []
+    if texto:
+        con = load_indice()
+        # Só as LIMITE_TABELA primeiras são ranqueadas (BM25): é o que a tabela mostra
+        ranking = buscar(con, texto, limite=LIMITE_TABELA)
+        mascara &= df_raw['id_vaga'].isin(ids_da_busca(con, texto)).to_numpy()
+    # Filtro de skills vetorizado sobre os arrays de ids (sem parsear as listas de cada vaga)
+    for skill in skills:
+        mascara &= tech_raw.contem(skill)
+    linhas = np.flatnonzero(mascara)
+    if ranking:
+        relevancia = pd.Series(range(len(ranking)), index=ranking, dtype=float)
+        ordem = df_raw['id_vaga'].iloc[linhas].map(relevancia).fillna(len(ranking))
+        linhas = linhas[ordem.to_numpy().argsort(kind='stable')]
+    return linhas
 
-# Aplica a normalização nas duas colunas de lista
-if 'tech_stack_lista' in df_raw.columns:
-    df_raw['tech_stack_lista'] = df_raw['tech_stack_lista'].apply(normalizar_techs)
+@st.cache_resource
+def filtrar_linhas(texto, skills, cargo, senioridade, tipo):
+    """Posições das vagas que passam em todos os filtros (busca, skills e as 3 dimensões)"""
+    linhas = linhas_da_busca(texto, skills) if texto or skills else np.arange(len(df_raw))
+    for col, selecionado in [('cargo_simplificado', cargo), ('senioridade_simplificada', senioridade), ('tipo_padronizado', tipo)]:
+        if selecionado != TODOS:
+            linhas = linhas[(df_raw[col].iloc[linhas] == selecionado).to_numpy()]
+    return linhas
 
-if 'cloud_lista' in df_raw.columns:
-    df_raw['cloud_lista'] = df_raw['cloud_lista'].apply(normalizar_techs)
+@st.cache_data
+def celula_do_recorte(texto, skills, cargo, senioridade, tipo):
+    """Só a célula selecionada, agregada sobre as vagas do recorte (o cubo não cobre busca/skills)"""
+    return agregar_celula(df_raw, filtrar_linhas(texto, skills, cargo, senioridade, tipo), tech_raw, cloud_raw)
+
+@st.cache_data
+def tabela_vagas(texto, skills, cargo, senioridade, tipo):
+    """Primeiras LIMITE_TABELA linhas da lista de vagas e o total, calculadas uma vez por combinação de filtros"""
+    linhas = filtrar_linhas(texto, skills, cargo, senioridade, tipo)
+    cols_show = ['titulo', 'cargo_simplificado', 'senioridade_simplificada', 'tipo_padronizado', 'empresa', 'link']
+    cols_show = [c for c in cols_show if c in df_raw.columns]
+    return df_raw[cols_show].iloc[linhas[:LIMITE_TABELA]], len(linhas)
 
-# --- SIDEBAR (3 FILTROS) ---
+# --- SIDEBAR (BUSCA + SKILLS + 3 FILTROS) ---
 st.sidebar.header("🔍 Filtros de Busca")
 
+texto_busca = st.sidebar.text_input("Buscar no título/descrição:", help='Use aspas para frases exatas (ex: "engenheiro de dados") e OR/NOT para combinar termos.').strip()
+
+# Skills ordenadas pela frequência (contagem vetorizada sobre o vocabulário)
+skills_por_frequencia = [tech_raw.vocab[i] for i in np.argsort(-tech_raw.contar(), kind='stable')]
+skills_selecionadas = tuple(st.sidebar.multiselect("Skills exigidas:", skills_por_frequencia, help="Mostra só as vagas que pedem TODAS as skills escolhidas."))
+
 # 1. Cargo
-cargos_unicos = sorted(df_raw['cargo_simplificado'].dropna().unique().tolist())
-cargo_selecionado = st.sidebar.selectbox("Área / Cargo:", ["Todos"] + cargos_unicos)
+cargos_unicos = cubo['dimensoes']['cargo_simplificado']
+cargo_selecionado = st.sidebar.selectbox("Área / Cargo:", [TODOS] + cargos_unicos)
 
 # 2. Senioridade
 ordem_senioridade = ["Estágio", "Junior", "Pleno", "Senior", "Especialista", "Gestão", "N/A"]
-senioridades_existentes = df_raw['senioridade_simplificada'].dropna().unique().tolist()
+senioridades_existentes = cubo['dimensoes']['senioridade_simplificada']
 senioridades_ordenadas = [s for s in ordem_senioridade if s in senioridades_existentes]
 senioridades_ordenadas += [s for s in senioridades_existentes if s not in ordem_senioridade]
-senior_selecionado = st.sidebar.selectbox("Nível de Experiência:", ["Todos"] + senioridades_ordenadas)
+senior_selecionado = st.sidebar.selectbox("Nível de Experiência:", [TODOS] + senioridades_ordenadas)
 
 # 3. Modelo de Trabalho (NOVO)
 tipos_unicos = ["Remoto", "Híbrido", "Presencial", "N/A"]
 # Filtra apenas os que existem no CSV para não mostrar opção vazia
-tipos_existentes = [t for t in tipos_unicos if t in df_raw['tipo_padronizado'].unique()]
-tipo_selecionado = st.sidebar.selectbox("Modelo de Trabalho:", ["Todos"] + tipos_existentes)
-
-# --- APLICAR FILTROS ---
-df_filtered = df_raw.copy()
-
-if cargo_selecionado != "Todos":
-    df_filtered = df_filtered[df_filtered['cargo_simplificado'] == cargo_selecionado]
-
-if senior_selecionado != "Todos":
-    df_filtered = df_filtered[df_filtered['senioridade_simplificada'] == senior_selecionado]
+tipos_existentes = [t for t in tipos_unicos if t in cubo['dimensoes']['tipo_padronizado']]
+tipo_selecionado = st.sidebar.selectbox("Modelo de Trabalho:", [TODOS] + tipos_existentes)
 
-if tipo_selecionado != "Todos":
-    df_filtered = df_filtered[df_filtered['tipo_padronizado'] == tipo_selecionado]
+# --- CONSULTA AO CUBO ---
+# Sem busca nem skills, a célula sai do cubo pré-calculado; com elas, só a célula selecionada é agregada
+filtros = (cargo_selecionado, senior_selecionado, tipo_selecionado)
+celula = None
+if texto_busca or skills_selecionadas:
+    try:
+        celula = celula_do_recorte(texto_busca, skills_selecionadas, *filtros)
+    except ValueError as e:
+        # Busca inválida (ex: começa com NOT): avisa e mostra o dashboard sem a busca
+        st.sidebar.error(f"⚠️ {e} Busca ignorada.")
+        texto_busca = ''
+if celula is None:
+    celula = celula_do_recorte('', skills_selecionadas, *filtros) if skills_selecionadas else cubo['celulas'].get(filtros)
+total_vagas = celula['vagas'] if celula else 0
 
 # --- DASHBOARD ---
 st.divider()
 
 col1, col2, col3, col4 = st.columns(4)
-col1.metric("Vagas Filtradas", len(df_filtered))
-col2.metric("Empresas", df_filtered['empresa'].nunique() if 'empresa' in df_filtered.columns else 0)
+col1.metric("Vagas Filtradas", total_vagas)
+col2.metric("Empresas", celula['empresas'] if celula else 0)
 
 # Métrica de Local ou Remoto
-if tipo_selecionado == "Todos":
+if tipo_selecionado == TODOS:
     # Se não filtrou tipo, mostra qual ganha (Ex: Maioria Remoto)
-    label_tipo = "Modelo Predominante"
-    mode_tipo = df_filtered['tipo_padronizado'].mode()
-    val_tipo = mode_tipo[0] if not mode_tipo.empty else "N/A"
-    col3.metric(label_tipo, val_tipo)
+    col3.metric("Modelo Predominante", celula['moda_tipo'] if celula else "N/A")
 else:
     # Se já filtrou, mostra o local físico mais comum
-    val_local = "N/A"
-    if 'local' in df_filtered.columns:
-        mode_local = df_filtered['local'].mode()
-        val_local = mode_local[0] if not mode_local.empty else "N/A"
-    col3.metric("Local Principal", val_local)
+    col3.metric("Local Principal", celula['moda_local'] if celula else "N/A")
 
 # Métrica de Salário/Senioridade
-label_info = "Nível Mais Comum"
-mode_info = df_filtered['senioridade_simplificada'].mode()
-val_info = mode_info[0] if not mode_info.empty else "N/A"
-col4.metric(label_info, val_info)
+col4.metric("Nível Mais Comum", celula['moda_senioridade'] if celula else "N/A")
 
 st.divider()
 
-if df_filtered.empty:
+if total_vagas == 0:
     st.info("Nenhuma vaga corresponde aos filtros selecionados.")
 else:
     col_left, col_right = st.columns(2)
@@ -178,10 +205,8 @@ else:
     with col_left:
         st.subheader("🛠️ Top Skills (Tech + Cloud)")
         # Como tech_stack agora inclui cloud, esse gráfico mostra tudo
-        if 'tech_stack_lista' in df_filtered.columns:
-            tech_counts = df_filtered.explode('tech_stack_lista')['tech_stack_lista'].value_counts().head(12).reset_index()
-            tech_counts.columns = ['Tecnologia', 'Contagem']
-            
+        tech_counts = pd.DataFrame(celula['top_tech'], columns=['Tecnologia', 'Contagem'])
+        if not tech_counts.empty:
             fig_tech = px.bar(tech_counts, x='Contagem', y='Tecnologia', orientation='h', 
                              color='Contagem', color_continuous_scale='viridis', text='Contagem')
             fig_tech.update_layout(yaxis={'categoryorder':'total ascending'})
@@ -190,19 +215,44 @@ else:
     with col_right:
         st.subheader("☁️ Ferramentas de Nuvem (Específico)")
         # Mantivemos este separado para quem quer ver SÓ cloud
-        if 'cloud_lista' in df_filtered.columns:
-            cloud_counts = df_filtered.explode('cloud_lista')['cloud_lista'].value_counts().head(10).reset_index()
-            cloud_counts.columns = ['Ferramenta', 'Contagem']
-            
-            if not cloud_counts.empty:
-                fig_cloud = px.bar(cloud_counts, x='Contagem', y='Ferramenta', orientation='h', 
-                                  color='Contagem', color_continuous_scale='magma', text='Contagem')
-                fig_cloud.update_layout(yaxis={'categoryorder':'total ascending'})
-                st.plotly_chart(fig_cloud, use_container_width=True)
-            else:
-                st.info("Nenhuma ferramenta de nuvem específica detectada nestas vagas.")
-
-    with st.expander(f"Ver lista de vagas filtradas ({len(df_filtered)})"):
-        cols_show = ['titulo', 'cargo_simplificado', 'senioridade_simplificada', 'tipo_padronizado', 'empresa', 'link']
-        cols_show = [c for c in cols_show if c in df_filtered.columns]
-        st.dataframe(df_filtered[cols_show], hide_index=True)
\ No newline at end of file
+        cloud_counts = pd.DataFrame(celula['top_cloud'], columns=['Ferramenta', 'Contagem'])
+        
+        if not cloud_counts.empty:
+            fig_cloud = px.bar(cloud_counts, x='Contagem', y='Ferramenta', orientation='h', 
+                              color='Contagem', color_continuous_scale='magma', text='Contagem')
+            fig_cloud.update_layout(yaxis={'categoryorder':'total ascending'})
+            st.plotly_chart(fig_cloud, use_container_width=True)
+        else:
+            st.info("Nenhuma ferramenta de nuvem específica detectada nestas vagas.")
+
+    # A lista de vagas precisa das linhas (não sai do cubo): só é montada quando o usuário pede
+    if st.toggle(f"Ver lista de vagas filtradas ({total_vagas})", key="ver_lista"):
+        tabela, total_tabela = tabela_vagas(texto_busca, skills_selecionadas, *filtros)
+        st.dataframe(tabela, hide_index=True)
+        if total_tabela > LIMITE_TABELA:
+            st.caption(f"Mostrando as {LIMITE_TABELA} primeiras de {total_tabela} vagas.")
+
+# --- TENDÊNCIAS (lidas direto dos rollups diários, sem recalcular o histórico) ---
+st.divider()
+st.subheader("📈 Tendências por Dia de Coleta")
+
+tendencias = load_tendencias()
+if len(tendencias.get('dias', {})) < 2:
+    st.info("As tendências aparecem a partir do segundo dia de coleta.")
+else:
+    col_vol, col_dim = st.columns(2)
+
+    with col_vol:
+        volume = pd.DataFrame({dia: {'Novas': r['novas'], 'Republicadas': r['republicadas']} for dia, r in sorted(tendencias['dias'].items())}).T
+        fig_vol = px.area(volume, labels={'index': 'Dia', 'value': 'Vagas', 'variable': ''}, title="Vagas coletadas (novas x republicadas)")
+        st.plotly_chart(fig_vol, use_container_width=True)
+
+    with col_dim:
+        dimensoes_tendencia = {"Área / Cargo": 'cargo_simplificado', "Nível de Experiência": 'senioridade_simplificada', "Modelo de Trabalho": 'tipo_padronizado'}
+        quebra = st.selectbox("Quebrar por:", list(dimensoes_tendencia))
+        fig_dim = px.line(serie(tendencias, dimensoes_tendencia[quebra]), markers=True, labels={'index': 'Dia', 'value': 'Vagas', 'variable': ''})
+        st.plotly_chart(fig_dim, use_container_width=True)
+
+    skills_dia = serie(tendencias, 'skills', top=8)
+    fig_skills = px.line(skills_dia, markers=True, labels={'index': 'Dia', 'value': 'Vagas', 'variable': 'Skill'}, title="Top Skills ao longo do tempo")
+    st.plotly_chart(fig_skills, use_container_width=True)
@@ -0,0 +1,116 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from extratores import extract_cargo_from_title, extract_senioridade_from_title, extract_tipo_trabalho_from_text, mesclar_skills
+from skills import limpar_lista
+
+# Backfill local (sem IA) em vários processos: o dataset é dividido em shards por faixa de
+# linhas, cada processo aplica as extrações por REGEX e a fusão Tech+Cloud no seu shard e os
+# resultados são concatenados na ordem dos shards (mesma saída para qualquer número de processos).
+
+COLUNAS_ENTRADA = ['titulo', 'local', 'cargo_simplificado', 'senioridade_simplificada', 'tipo_padronizado', 'tech_stack', 'cloud']
+COLUNAS_SAIDA = ['cargo_simplificado', 'senioridade_simplificada', 'tipo_padronizado', 'tech_stack']
+VAZIOS = ["None", "nan", "", "N/A"]
+
+def _preenche(atual, extrator, texto):
+    """Mantém o valor atual se já estiver preenchido; senão tenta o REGEX"""
+    if str(atual) not in VAZIOS: return atual
+    return extrator(texto) or atual
+
+def processar_shard(shard):
+    """Aplica as extrações locais em um shard (dict coluna -> lista) e devolve as colunas de saída"""
+    saida = {col: [] for col in COLUNAS_SAIDA}
+    for titulo, local, cargo, senior, tipo, tech, cloud in zip(*(shard[col] for col in COLUNAS_ENTRADA)):
+        titulo = str(titulo)
+        saida['cargo_simplificado'].append(_preenche(cargo, extract_cargo_from_title, titulo))
+        saida['senioridade_simplificada'].append(_preenche(senior, extract_senioridade_from_title, titulo))
+        saida['tipo_padronizado'].append(_preenche(tipo, extract_tipo_trabalho_from_text, f"{titulo} {local}"))
+
+        skills, cloud_tools = limpar_lista(tech), limpar_lista(cloud)
+        if isinstance(skills, list) and isinstance(cloud_tools, list) and cloud_tools:
+            tech = str(mesclar_skills(skills, cloud_tools))
+        saida['tech_stack'].append(tech)
+    return saida
+
+def backfill(df, workers=None, tamanho_shard=20000):
+    """Roda o backfill local no DataFrame usando `workers` processos"""
+    for col in COLUNAS_ENTRADA:
+        if col not in df.columns:
+            df[col] = None
+        df[col] = df[col].astype(object)
+
+    shards = [df[COLUNAS_ENTRADA].iloc[i:i + tamanho_shard].to_dict('list') for i in range(0, len(df), tamanho_shard)]
+    if workers == 1:
+        resultados = [processar_shard(shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            resultados = list(executor.map(processar_shard, shards))  # map preserva a ordem dos shards
+
+    for col in COLUNAS_SAIDA:
+        df[col] = [valor for resultado in resultados for valor in resultado[col]]
+    return df
+
+def dataset_sintetico(df_base, linhas):
+    """Gera `linhas` vagas sorteando títulos/locais/skills do CSV real (colunas alvo vazias)"""
+    amostra = df_base.sample(n=linhas, replace=True, random_state=42).reset_index(drop=True)
+    for col in ['cargo_simplificado', 'senioridade_simplificada', 'tipo_padronizado']:
+        amostra[col] = None
+    return amostra
+
+def benchmark(df_base, linhas, max_workers, tamanho_shard):
+    print(f"🧪 Benchmark com {linhas} linhas sintéticas (1 a {max_workers} processos)")
+    sintetico = dataset_sintetico(df_base.drop(columns=['descricao_raw'], errors='ignore'), linhas)
+    referencia = None
+    base = None
+    for workers in range(1, max_workers + 1):
+        inicio = time.perf_counter()
+        resultado = backfill(sintetico.copy(), workers, tamanho_shard)
+        duracao = time.perf_counter() - inicio
+        base = base or duracao
+        # Confere que a saída é idêntica para qualquer número de processos
+        if referencia is None: referencia = resultado
+        identico = referencia[COLUNAS_SAIDA].equals(resultado[COLUNAS_SAIDA])
+        print(f"  {workers} processo(s): {linhas / duracao:,.0f} linhas/s | speedup {base / duracao:.2f}x | saída idêntica: {identico}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill local (REGEX + fusão de skills) em vários processos")
+    parser.add_argument('arquivo_csv', nargs='?', default='dados_vagas_linkedin.csv')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--shard', type=int, default=20000, help="linhas por shard")
+    parser.add_argument('--benchmark', type=int, metavar='LINHAS', help="mede linhas/s de 1 a --workers processos num dataset sintético")
+    args = parser.parse_args()
+
+    # pandas, o cubo e as tendências só no processo principal: os workers importam apenas extratores/skills
+    import pandas as pd
+    from cubo import construir_cubo, salvar_cubo, ARQUIVO_CUBO
+    from tendencias import atualizar_tendencias, carregar_tendencias, salvar_tendencias, carregar_vistas, salvar_vistas
+
+    print(f"📂 Lendo {args.arquivo_csv}...")
+    df = pd.read_csv(args.arquivo_csv)
+
+    if args.benchmark:
+        benchmark(df, args.benchmark, args.workers, args.shard)
+    else:
+        antes = df.reindex(columns=COLUNAS_SAIDA).astype(object)
+        inicio = time.perf_counter()
+        df = backfill(df, args.workers, args.shard)
+        print(f"⚡ {len(df)} linhas em {time.perf_counter() - inicio:.1f}s com {args.workers} processo(s)")
+        df.to_csv(args.arquivo_csv, index=False)
+        salvar_cubo(construir_cubo(df))
+        print(f"✅ CSV atualizado e cubo salvo em {ARQUIVO_CUBO}")
+
+        # O backfill regrava linhas antigas no lugar (o CSV não cresce): as tendências precisam
+        # saber quais dias mudaram, senão continuam com os valores de antes
+        depois = df[COLUNAS_SAIDA]
+        alteradas = ~((antes == depois) | (antes.isna() & depois.isna())).all(axis=1)
+        dias_alterados = set(df.loc[alteradas, 'data_coleta'].dropna()) if 'data_coleta' in df.columns else set()
+        tendencias, vistas = carregar_tendencias(), carregar_vistas()
+        dias = atualizar_tendencias(df, tendencias, vistas, dias_alterados)
+        salvar_tendencias(tendencias)
+        salvar_vistas(vistas)
+        print(f"📈 Tendências atualizadas ({len(dias)} dia(s) reagregado(s))")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import re
+import sqlite3
+import sys
+
+# Índice invertido (SQLite FTS5) sobre título e descrição das vagas, com ranking BM25.
+# O rowid do índice é o id da vaga no LinkedIn, então reindexar é incremental:
+# só entram vagas que ainda não estão no índice.
+
+ARQUIVO_INDICE = 'indice_vagas.db'
+PESO_TITULO = 5.0
+PESO_DESCRICAO = 1.0
+OPERADORES = {'AND', 'OR', 'NOT'}
+
+def id_da_vaga(link):
+    """Extrai o id numérico da vaga do link (https://www.linkedin.com/jobs/view/<id>)"""
+    match = re.search(r'/jobs/view/(\d+)', str(link))
+    return int(match.group(1)) if match else None
+
+def abrir_indice(caminho=ARQUIVO_INDICE):
+    con = sqlite3.connect(caminho, check_same_thread=False)
+    con.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS vagas_fts
+                   USING fts5(titulo, descricao, tokenize='unicode61 remove_diacritics 2')""")
+    return con
+
+def indexar_vaga(con, job_id, titulo, descricao):
+    """Adiciona uma vaga ao índice (ignora se o id já estiver indexado). Retorna 1 se entrou."""
+    return con.execute("""INSERT INTO vagas_fts(rowid, titulo, descricao)
+                   SELECT ?, ?, ? WHERE NOT EXISTS (SELECT 1 FROM vagas_fts WHERE rowid = ?)""",
+                (job_id, titulo, descricao, job_id)).rowcount
+
+def atualizar_indice(con, df, armazem=None):
+    """Indexa as vagas do DataFrame que ainda não estão no índice. Retorna quantas entraram.
+
+    Se o CSV já foi migrado (sem descricao_raw), as descrições vêm do `armazem` (ArquivoDescricoes).
+    """
+    import pandas as pd  # O scraper importa este módulo só para indexar_vaga; pandas fica para quem usa
+
+    tem_descricao = 'descricao_raw' in df.columns
+    colunas = ['link', 'titulo'] + (['descricao_raw'] if tem_descricao else [])
+    novas = 0
+    with con:
+        for row in df[colunas].itertuples(index=False):
+            job_id = id_da_vaga(row.link)
+            if job_id is None: continue
+            if con.execute("SELECT 1 FROM vagas_fts WHERE rowid = ?", (job_id,)).fetchone(): continue
+            titulo = '' if pd.isna(row.titulo) else str(row.titulo)
+            descricao = row.descricao_raw if tem_descricao else (armazem.ler(job_id) if armazem else None)
+            descricao = '' if descricao is None or pd.isna(descricao) else str(descricao)
+            novas += indexar_vaga(con, job_id, titulo, descricao)
+    return novas
+
+def _consulta_fts(texto):
+    """Converte o texto digitado em consulta FTS5 segura.
+
+    Frases entre aspas viram phrase queries, AND/OR/NOT são mantidos e os demais
+    termos são escapados (um hífen ou dois-pontos soltos não quebram a consulta).
+    NOT no começo não tem termo à esquerda para excluir (FTS5 é binário): levanta ValueError
+    em vez de descartar o operador e devolver o contrário do que foi pedido.
+    """
+    partes = []
+    for termo in re.findall(r'"[^"]*"|\S+', texto):
+        if termo in OPERADORES:
+            partes.append(termo)
+        else:
+            termo = termo.strip('"').replace('"', '""')
+            if termo: partes.append(f'"{termo}"')
+    # Operador sobrando no começo/fim é erro de sintaxe no FTS5
+    while partes and partes[0] in {'AND', 'OR'}: partes.pop(0)
+    if partes and partes[0] == 'NOT':
+        raise ValueError("A busca não pode começar com NOT: use um termo antes (ex: engineer NOT python).")
+    while partes and partes[-1] in OPERADORES: partes.pop()
+    return ' '.join(partes)
+
+def buscar(con, texto, limite=None):
+    """Ids das vagas que casam com a busca, do mais para o menos relevante (BM25).
+
+    Ranquear exige pontuar todas as vagas que casam: para contagens e agregados use
+    `ids_da_busca` (sem ordenação) e deixe `limite` só para as linhas exibidas.
+    """
+    consulta = _consulta_fts(texto)
+    if not consulta: return []
+    try:
+        linhas = con.execute(f"""SELECT rowid FROM vagas_fts WHERE vagas_fts MATCH ?
+                                 ORDER BY bm25(vagas_fts, {PESO_TITULO}, {PESO_DESCRICAO}) LIMIT ?""",
+                             (consulta, -1 if limite is None else limite)).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    return [job_id for (job_id,) in linhas]
+
+def ids_da_busca(con, texto):
+    """Todos os ids que casam com a busca, sem ranking (para contar e agregar)"""
+    consulta = _consulta_fts(texto)
+    if not consulta: return []
+    try:
+        linhas = con.execute("SELECT rowid FROM vagas_fts WHERE vagas_fts MATCH ?", (consulta,)).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    return [job_id for (job_id,) in linhas]
+
+def main():
+    import pandas as pd
+
+    arquivo_csv = sys.argv[1] if len(sys.argv) > 1 else 'dados_vagas_linkedin.csv'
+    print(f"📂 Lendo {arquivo_csv}...")
+    from descricoes import ArquivoDescricoes
+
+    con = abrir_indice()
+    novas = atualizar_indice(con, pd.read_csv(arquivo_csv), ArquivoDescricoes())
+    print(f"✅ {novas} vagas novas indexadas em {ARQUIVO_INDICE}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+import base64
+import hashlib
+import heapq
+import itertools
+import json
+import math
+import os
+import sys
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from skills import SkillsCompactas
+
+# Cubo de agregados pré-calculados para os filtros do dashboard (cargo x senioridade x tipo).
+# Cada célula guarda contagem, sketch de empresas distintas, modas e top-k de skills,
+# incluindo os rollups "Todos" de cada dimensão.
+
+ARQUIVO_CUBO = 'cubo_vagas.json'
+TODOS = "Todos"
+DIMENSOES = ['cargo_simplificado', 'senioridade_simplificada', 'tipo_padronizado']
+TOP_TECH = 12
+TOP_CLOUD = 10
+
+class HyperLogLog:
+    """Sketch de cardinalidade aproximada (HyperLogLog) com 2^p registradores"""
+
+    def __init__(self, p=10, registradores=None):
+        self.p = p
+        self.m = 1 << p
+        self.registradores = bytearray(registradores) if registradores else bytearray(self.m)
+
+    def add(self, valor):
+        h = int.from_bytes(hashlib.blake2b(str(valor).encode('utf-8'), digest_size=8).digest(), 'big')
+        idx = h >> (64 - self.p)
+        resto = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - resto.bit_length() + 1
+        if rank > self.registradores[idx]:
+            self.registradores[idx] = rank
+
+    def merge(self, outro):
+        self.registradores = bytearray(map(max, self.registradores, outro.registradores))
+
+    def estimativa(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimativa = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registradores)
+        zeros = self.registradores.count(0)
+        # Correção para cardinalidades pequenas (linear counting)
+        if estimativa <= 2.5 * self.m and zeros:
+            estimativa = self.m * math.log(self.m / zeros)
+        return int(round(estimativa))
+
+    def to_base64(self):
+        return base64.b64encode(bytes(self.registradores)).decode('ascii')
+
+    @classmethod
+    def from_base64(cls, texto, p=10):
+        return cls(p, base64.b64decode(texto))
+
+class _Celula:
+    """Acumuladores de uma combinação de filtros durante a construção do cubo"""
+
+    def __init__(self, n_tech, n_cloud):
+        self.vagas = 0
+        self.linhas = []
+        self.empresas = HyperLogLog()
+        self.tipos = Counter()
+        self.locais = Counter()
+        self.senioridades = Counter()
+        # Contagens de skills indexadas pelo id do vocabulário (SkillsCompactas)
+        self.tech = np.zeros(n_tech, dtype=np.int64)
+        self.cloud = np.zeros(n_cloud, dtype=np.int64)
+
+    def merge(self, outra):
+        self.vagas += outra.vagas
+        self.empresas.merge(outra.empresas)
+        for nome in ['tipos', 'locais', 'senioridades']:
+            getattr(self, nome).update(getattr(outra, nome))
+        self.tech += outra.tech
+        self.cloud += outra.cloud
+
+def _valor(valor):
+    return None if pd.isna(valor) else str(valor)
+
+def _moda(contagem):
+    """Valor mais frequente (empate resolvido em ordem alfabética, como o pandas.mode)"""
+    if not contagem: return "N/A"
+    return min(contagem.items(), key=lambda kv: (-kv[1], kv[0]))[0]
+
+def _top_k(contagem, vocab, k):
+    presentes = np.flatnonzero(contagem)
+    return [[vocab[i], int(contagem[i])] for i in heapq.nlargest(k, presentes, key=contagem.__getitem__)]
+
+def construir_cubo(df, tech=None, cloud=None):
+    """Agrega o DataFrame em todas as combinações de filtros (incluindo rollups "Todos").
+
+    `tech` e `cloud` são as skills já em SkillsCompactas, alinhadas às linhas de `df`;
+    se não forem passadas, são convertidas das colunas tech_stack/cloud.
+    """
+    for col in DIMENSOES:
+        if col not in df.columns:
+            df = df.assign(**{col: 'N/A'})
+    vazia = pd.Series([None] * len(df), dtype=object)
+    if tech is None: tech = SkillsCompactas.de_coluna(df['tech_stack'] if 'tech_stack' in df.columns else vazia)
+    if cloud is None: cloud = SkillsCompactas.de_coluna(df['cloud'] if 'cloud' in df.columns else vazia)
+    nova_celula = lambda: _Celula(len(tech.vocab), len(cloud.vocab))
+
+    # 1. Uma passada nas vagas para montar as células-folha (combinações exatas)
+    folhas = {}
+    for posicao, row in enumerate(df.to_dict('records')):
+        chave = tuple(_valor(row[col]) for col in DIMENSOES)
+        celula = folhas.setdefault(chave, nova_celula())
+        celula.vagas += 1
+        celula.linhas.append(posicao)
+        empresa = _valor(row.get('empresa'))
+        if empresa is not None: celula.empresas.add(empresa)
+        for campo, contagem in [('tipo_padronizado', celula.tipos), ('local', celula.locais), ('senioridade_simplificada', celula.senioridades)]:
+            valor = _valor(row.get(campo))
+            if valor is not None: contagem[valor] += 1
+
+    # Skills de cada folha contadas de uma vez (bincount sobre os ids das linhas da folha)
+    for celula in folhas.values():
+        celula.tech = tech.contar(celula.linhas)
+        celula.cloud = cloud.contar(celula.linhas)
+
+    # 2. Rollups: cada folha é somada em todas as combinações onde alguma dimensão vira "Todos"
+    celulas = {}
+    for chave, folha in folhas.items():
+        for mascara in itertools.product([False, True], repeat=len(DIMENSOES)):
+            destino = tuple(TODOS if rollup else valor for valor, rollup in zip(chave, mascara))
+            if None in destino: continue
+            celulas.setdefault(destino, nova_celula()).merge(folha)
+
+    dimensoes = {col: sorted({chave[i] for chave in folhas if chave[i] is not None}) for i, col in enumerate(DIMENSOES)}
+    return {
+        "dimensoes": dimensoes,
+        "celulas": [
+            {
+                "chave": list(chave),
+                "vagas": celula.vagas,
+                "empresas": celula.empresas.estimativa(),
+                "empresas_hll": celula.empresas.to_base64(),
+                "moda_tipo": _moda(celula.tipos),
+                "moda_local": _moda(celula.locais),
+                "moda_senioridade": _moda(celula.senioridades),
+                "top_tech": _top_k(celula.tech, tech.vocab, TOP_TECH),
+                "top_cloud": _top_k(celula.cloud, cloud.vocab, TOP_CLOUD),
+            }
+            for chave, celula in celulas.items()
+        ],
+    }
+
+def _moda_serie(serie):
+    """Mesma regra de _moda, com a contagem feita pelo pandas"""
+    contagem = serie.dropna().astype(str).value_counts()
+    if contagem.empty: return "N/A"
+    return min(contagem.index[contagem == contagem.iloc[0]])
+
+def agregar_celula(df, linhas, tech, cloud):
+    """Célula do cubo (mesmos campos) só para as vagas nas posições `linhas`, sem montar o cubo inteiro.
+
+    Para recortes que não estão pré-calculados (busca textual, filtro de skills): custa O(linhas)
+    em operações vetorizadas do numpy/pandas, e as empresas distintas são contadas de forma exata.
+    """
+    # Só as colunas usadas são recortadas (df.iloc copiaria todas)
+    coluna = lambda col: df[col].iloc[linhas] if col in df.columns else pd.Series(dtype=object)
+    return {
+        "vagas": len(linhas),
+        "empresas": int(coluna('empresa').nunique()),
+        "moda_tipo": _moda_serie(coluna('tipo_padronizado')),
+        "moda_local": _moda_serie(coluna('local')),
+        "moda_senioridade": _moda_serie(coluna('senioridade_simplificada')),
+        "top_tech": _top_k(tech.contar(linhas), tech.vocab, TOP_TECH),
+        "top_cloud": _top_k(cloud.contar(linhas), cloud.vocab, TOP_CLOUD),
+    }
+
+def salvar_cubo(cubo, caminho=ARQUIVO_CUBO):
+    with open(caminho, 'w', encoding='utf-8') as file:
+        json.dump(cubo, file, ensure_ascii=False)
+
+def indexar_cubo(cubo):
+    """Indexa as células por (cargo, senioridade, tipo) para consulta O(1)"""
+    return {**cubo, "celulas": {tuple(celula["chave"]): celula for celula in cubo["celulas"]}}
+
+def carregar_cubo(caminho=ARQUIVO_CUBO):
+    with open(caminho, 'r', encoding='utf-8') as file:
+        return indexar_cubo(json.load(file))
+
+def cubo_desatualizado(arquivo_csv, caminho=ARQUIVO_CUBO):
+    return not os.path.isfile(caminho) or os.path.getmtime(caminho) < os.path.getmtime(arquivo_csv)
+
+def main():
+    arquivo_csv = sys.argv[1] if len(sys.argv) > 1 else 'dados_vagas_linkedin.csv'
+    print(f"📂 Lendo {arquivo_csv}...")
+    cubo = construir_cubo(pd.read_csv(arquivo_csv))
+    salvar_cubo(cubo)
+    print(f"✅ Cubo salvo em {ARQUIVO_CUBO} ({len(cubo['celulas'])} combinações de filtros)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import mmap
+import os
+import struct
+import sys
+import time
+
+import zstandard as zstd
+
+# Armazém das descrições (descricao_raw) separado do CSV: cada descrição é um frame zstd
+# independente num arquivo append-only, e um índice binário (id da vaga -> offset, tamanho)
+# permite ler uma única descrição via mmap sem tocar no resto do dataset.
+# Os três arquivos são versionados (via git LFS) junto com o CSV, que depois da migração
+# não tem mais as descrições: é deles que o app e o índice de busca leem no deploy.
+
+ARQUIVO_BLOBS = 'descricoes.bin'
+ARQUIVO_INDICE = 'descricoes.idx'
+ARQUIVO_DICIONARIO = 'descricoes.dict'
+
+REGISTRO = struct.Struct('<QQI')     # id da vaga, offset no arquivo de blobs, tamanho comprimido
+NIVEL_ZSTD = 10
+TAMANHO_DICIONARIO = 112 * 1024
+MIN_AMOSTRAS_DICIONARIO = 500        # Com poucas vagas o dicionário não compensa (e o treino falha)
+
+class ArquivoDescricoes:
+    """Descrições comprimidas com zstd, com acesso aleatório por id da vaga"""
+
+    def __init__(self, pasta='.'):
+        self.caminho_blobs = os.path.join(pasta, ARQUIVO_BLOBS)
+        self.caminho_indice = os.path.join(pasta, ARQUIVO_INDICE)
+        self.caminho_dicionario = os.path.join(pasta, ARQUIVO_DICIONARIO)
+        self._mmap = None
+        self._carregar_dicionario()
+        self.indice = self._ler_indice()
+
+    def _carregar_dicionario(self):
+        dicionario = None
+        if os.path.isfile(self.caminho_dicionario):
+            with open(self.caminho_dicionario, 'rb') as file:
+                dicionario = zstd.ZstdCompressionDict(file.read())
+        self._compressor = zstd.ZstdCompressor(level=NIVEL_ZSTD, dict_data=dicionario)
+        self._descompressor = zstd.ZstdDecompressor(dict_data=dicionario)
+
+    def _ler_indice(self):
+        if not os.path.isfile(self.caminho_indice): return {}
+        with open(self.caminho_indice, 'rb') as file:
+            dados = file.read()
+        # Registro incompleto no fim (escrita interrompida) é ignorado na leitura e cortado
+        # pelo próximo `adicionar` (quem lê pode estar rodando junto com o scraper e não trunca)
+        fim = len(dados) - len(dados) % REGISTRO.size
+        return {job_id: (offset, tamanho) for job_id, offset, tamanho in REGISTRO.iter_unpack(dados[:fim])}
+
+    def treinar_dicionario(self, amostras):
+        """Treina o dicionário zstd com descrições de exemplo (só antes do primeiro blob ser gravado)"""
+        if self.indice or len(amostras) < MIN_AMOSTRAS_DICIONARIO: return False
+        try:
+            dicionario = zstd.train_dictionary(TAMANHO_DICIONARIO, [texto.encode('utf-8') for texto in amostras])
+        except zstd.ZstdError:
+            return False
+        with open(self.caminho_dicionario, 'wb') as file:
+            file.write(dicionario.as_bytes())
+        self._carregar_dicionario()
+        return True
+
+    def __contains__(self, job_id):
+        return job_id in self.indice
+
+    def __len__(self):
+        return len(self.indice)
+
+    def adicionar(self, job_id, texto):
+        """Grava a descrição no fim do arquivo (ignora ids já armazenados). Retorna True se gravou."""
+        if job_id in self.indice: return False
+        blob = self._compressor.compress(texto.encode('utf-8'))
+        with open(self.caminho_blobs, 'ab') as file:
+            offset = file.tell()
+            file.write(blob)
+        # O índice só é escrito depois do blob: se cair no meio, sobra lixo no fim dos blobs, não um id quebrado
+        with open(self.caminho_indice, 'ab') as file:
+            # Sobra de um registro pela metade desalinharia todos os registros gravados depois dela
+            fim = file.tell()
+            if fim % REGISTRO.size: file.truncate(fim - fim % REGISTRO.size)
+            file.write(REGISTRO.pack(job_id, offset, len(blob)))
+        self.indice[job_id] = (offset, len(blob))
+        return True
+
+    def ler(self, job_id):
+        """Descrição da vaga (ou None se não estiver no armazém)"""
+        if job_id not in self.indice: return None
+        offset, tamanho = self.indice[job_id]
+        if self._mmap is None or offset + tamanho > len(self._mmap):
+            self._remapear()
+        return self._descompressor.decompress(self._mmap[offset:offset + tamanho]).decode('utf-8')
+
+    def _remapear(self):
+        if self._mmap is not None: self._mmap.close()
+        with open(self.caminho_blobs, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def fechar(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+def migrar_csv(arquivo_csv, pasta='.'):
+    """Move descricao_raw do CSV para o armazém e regrava o CSV só com os metadados"""
+    import pandas as pd
+    from busca import id_da_vaga
+
+    df = pd.read_csv(arquivo_csv)
+    if 'descricao_raw' not in df.columns:
+        print("CSV já está sem descricao_raw.")
+        return
+
+    armazem = ArquivoDescricoes(pasta)
+    descricoes = df['descricao_raw'].dropna().astype(str).tolist()
+    if armazem.treinar_dicionario(descricoes[:5000]):
+        print(f"📖 Dicionário zstd treinado com {min(len(descricoes), 5000)} descrições")
+
+    gravadas = 0
+    for link, descricao in zip(df['link'], df['descricao_raw']):
+        job_id = id_da_vaga(link)
+        if job_id is None or pd.isna(descricao): continue
+        gravadas += armazem.adicionar(job_id, str(descricao))
+    armazem.fechar()
+
+    df.drop(columns=['descricao_raw']).to_csv(arquivo_csv, index=False)
+    print(f"✅ {gravadas} descrições movidas para {ARQUIVO_BLOBS}")
+    # O CSV versionado deixa de ter as descrições: o armazém precisa ir junto no commit/deploy
+    print(f"📌 Versione {ARQUIVO_BLOBS}, {ARQUIVO_INDICE} e {ARQUIVO_DICIONARIO} junto com o CSV (git LFS, ver .gitattributes).")
+
+def comparar(arquivo_csv, pasta='.'):
+    """Tamanho em disco e tempo de carga: CSV completo x CSV de metadados + armazém"""
+    import pandas as pd
+    import tempfile
+
+    inicio = time.perf_counter()
+    df = pd.read_csv(arquivo_csv)
+    tempo_csv = time.perf_counter() - inicio
+    if 'descricao_raw' not in df.columns:
+        print("Rode a comparação antes de migrar (o CSV precisa ter descricao_raw).")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        copia = os.path.join(tmp, os.path.basename(arquivo_csv))
+        df.to_csv(copia, index=False)
+        migrar_csv(copia, tmp)
+
+        inicio = time.perf_counter()
+        pd.read_csv(copia)
+        tempo_metadados = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        armazem = ArquivoDescricoes(tmp)
+        tempo_indice = time.perf_counter() - inicio
+        job_id = next(iter(armazem.indice))
+        inicio = time.perf_counter()
+        armazem.ler(job_id)
+        tempo_leitura = time.perf_counter() - inicio
+        armazem.fechar()
+
+        tamanho = lambda nome: os.path.getsize(os.path.join(tmp, nome)) if os.path.isfile(os.path.join(tmp, nome)) else 0
+        print(f"CSV completo:           {os.path.getsize(arquivo_csv) / 1e6:8.2f} MB | carga {tempo_csv * 1000:8.1f} ms")
+        print(f"CSV só metadados:       {os.path.getsize(copia) / 1e6:8.2f} MB | carga {tempo_metadados * 1000:8.1f} ms")
+        print(f"Descrições (zstd):      {(tamanho(ARQUIVO_BLOBS) + tamanho(ARQUIVO_DICIONARIO)) / 1e6:8.2f} MB | índice {tamanho(ARQUIVO_INDICE) / 1e6:.2f} MB, carga {tempo_indice * 1000:.1f} ms")
+        print(f"Leitura de 1 descrição: {tempo_leitura * 1000:.3f} ms")
+
+def main():
+    args = sys.argv[1:]
+    if args and args[0] == '--comparar':
+        comparar(args[1] if len(args) > 1 else 'dados_vagas_linkedin.csv')
+    else:
+        migrar_csv(args[0] if args else 'dados_vagas_linkedin.csv')
+
+if __name__ == "__main__":
+    main()
@@ -1,165 +1,23 @@
-import pandas as pd
-import google.generativeai as genai
 import os
-import json
 import time
-import re
-from dotenv import load_dotenv
-from tqdm import tqdm
+from functools import lru_cache
+from busca import id_da_vaga
+from descricoes import ArquivoDescricoes
+from extratores import extract_cargo_from_title, extract_senioridade_from_title, extract_tipo_trabalho_from_text, mesclar_skills
+from llm_json import parse_llm_json, json_generation_config, falhas_por_campo, ExtracaoTitulo, ExtracaoDescricao, MODELO_JSON
+from skills import limpar_lista
 
-# Carrega API Key
-load_dotenv()
-api_key = os.getenv("GEMINI_API_KEY")
+# pandas, tqdm, o cubo e a SDK do Gemini são importados só quando usados: importar este
+# módulo (testes, benchmark, workers) não configura a IA nem processa o CSV
 
-if not api_key:
-    print("ERRO: API Key não encontrada no .env")
-    exit()
+@lru_cache(maxsize=None)
+def get_model():
+    """Configura o Gemini na primeira chamada e reaproveita o modelo nas seguintes"""
+    import google.generativeai as genai
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai.GenerativeModel(MODELO_JSON)
 
-genai.configure(api_key=api_key)
-model = genai.GenerativeModel('models/gemini-flash-latest')
-
-# --- FUNÇÕES DE EXTRAÇÃO POR REGEX (Executam ANTES da IA) ---
-
-def extract_cargo_from_title(titulo):
-    """Extrai cargo do título usando REGEX antes de chamar IA"""
-    titulo_lower = titulo.lower()
-    
-    # Padrões de cargos (português e inglês)
-    cargos_map = {
-        'Data Engineer': [
-            r'data\s*engineer', 
-            r'engenh[ea]ir[oa]\s*(?:\(a\))?\s*de\s*dados',  # Captura Engenheiro(a), Engenheira, Engenheiro
-            r'eng\.?\s*(?:\(a\))?\s*dados',  # Eng. Dados ou Eng(a) Dados
-            r'data\s*platform\s*engineer'
-        ],
-        'Data Scientist': [
-            r'data\s*scientist', 
-            r'cientista\s*de\s*dados', 
-            r'data\s*science(?!\s*engineer)'  # Evita pegar "Data Science Engineer"
-        ],
-        'Machine Learning Engineer': [
-            r'machine\s*learning\s*engineer', 
-            r'ml\s*engineer', 
-            r'mlops\s*engineer', 
-            r'ai\s*engineer', 
-            r'artificial\s*intelligence\s*engineer'
-        ],
-        'Analytics Engineer': [
-            r'analytics\s*engineer', 
-            r'engenh[ea]ir[oa]\s*(?:\(a\))?\s*de\s*analytics', 
-            r'bi\s*engineer'
-        ],
-        'Data Analyst': [
-            r'data\s*analyst', 
-            r'analista\s*de\s*dados', 
-            r'business\s*intelligence\s*analyst', 
-            r'bi\s*analyst'
-        ],
-        'Software Engineer': [
-            r'software\s*engineer', 
-            r'engenh[ea]ir[oa]\s*(?:\(a\))?\s*de\s*software', 
-            r'backend\s*engineer', 
-            r'full\s*stack', 
-            r'fullstack'
-        ]
-    }
-    
-    for cargo, patterns in cargos_map.items():
-        for pattern in patterns:
-            if re.search(pattern, titulo_lower):
-                return cargo
-    
-    return None  # Retorna None se não encontrar
-
-def extract_senioridade_from_title(titulo):
-    """Extrai senioridade do título usando REGEX antes de chamar IA"""
-    titulo_lower = titulo.lower()
-    
-    # Padrões de senioridade (português e inglês) - ordem importa (mais específico primeiro)
-    senioridade_patterns = {
-        'Estágio': [
-            r'\bintern\b', 
-            r'\btrainee\b', 
-            r'\bestag', 
-            r'\bestagiário\b'
-        ],
-        'Junior': [
-            r'\bjr\.?\b',  # Jr ou Jr.
-            r'\bjunior\b', 
-            r'\bjúnior\b', 
-            r'\bi\b(?!\s*\w)',  # I isolado
-            r'\bj[úu]nior\b'  # Aceita júnior e junior
-        ],
-        'Pleno': [
-            r'\bpleno\b', 
-            r'\bmid\b', 
-            r'\bpl\b',  # PL (case insensitive por causa do .lower())
-            r'\bmid-level\b', 
-            r'\bmidlevel\b', 
-            r'\bii\b', 
-            r'\biii\b'
-        ],
-        'Senior': [
-            r'\bsenior\b', 
-            r'\bs[êe]nior\b',  # Aceita sênior e senior
-            r'\bsr\.?\b',  # Sr ou Sr.
-            r'\biv\b', 
-            r'\bv\b'
-        ],
-        'Especialista': [
-            r'\bstaff\b', 
-            r'\bprincipal\b', 
-            r'\blead\b', 
-            r'\bexpert\b', 
-            r'\bspecialist\b', 
-            r'\bespecialista\b', 
-            r'\barchitect\b'
-        ],
-        'Gestão': [
-            r'\bmanager\b', 
-            r'\bgerente\b', 
-            r'\bhead\b', 
-            r'\bdirector\b', 
-            r'\bdiretor\b', 
-            r'\bvp\b', 
-            r'\bchief\b'
-        ]
-    }
-    
-    for senioridade, patterns in senioridade_patterns.items():
-        for pattern in patterns:
-            if re.search(pattern, titulo_lower):
-                return senioridade
-    
-    return None  # Retorna None se não encontrar
-
-def extract_tipo_trabalho_from_text(texto):
-    """Extrai tipo de trabalho (Remoto/Híbrido/Presencial) de título ou local usando REGEX"""
-    texto_lower = texto.lower()
-    
-    # Padrões de tipo de trabalho
-    if re.search(r'\b(remote|remoto|100%\s*remote|work\s*from\s*home|wfh|anywhere|fully\s*remote)\b', texto_lower):
-        return 'Remoto'
-    elif re.search(r'\b(hybrid|híbrido|hibrido|flex)\b', texto_lower):
-        return 'Híbrido'
-    elif re.search(r'\b(on-site|onsite|presencial|in-office|office)\b', texto_lower):
-        return 'Presencial'
-    
-    return None  # Retorna None se não encontrar
-
-def clean_and_parse_json(response_text):
-    if not response_text: return None
-    try:
-        return json.loads(response_text)
-    except:
-        pass
-    try:
-        match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if match:
-            return json.loads(match.group(0))
-    except:
-        return None
-    return None
+# --- FUNÇÕES DE IA (as extrações por REGEX ficam em extratores.py) ---
 
 def classify_from_title(titulo):
     """ETAPA 1: Analisa APENAS o título para classificação rápida"""
@@ -202,8 +60,8 @@ def classify_from_title(titulo):
     
     while tentativas < max_tentativas:
         try:
-            response = model.generate_content(prompt)
-            return clean_and_parse_json(response.text)
+            response = get_model().generate_content(prompt, generation_config=json_generation_config(ExtracaoTitulo))
+            return parse_llm_json(response.text, ExtracaoTitulo)
         except Exception as e:
             if "429" in str(e) or "quota" in str(e).lower():
                 time.sleep((tentativas + 1) * 5)
@@ -276,8 +134,8 @@ def extract_skills_from_description(description, titulo):
     
     while tentativas < max_tentativas:
         try:
-            response = model.generate_content(prompt)
-            return clean_and_parse_json(response.text)
+            response = get_model().generate_content(prompt, generation_config=json_generation_config(ExtracaoDescricao))
+            return parse_llm_json(response.text, ExtracaoDescricao)
         except Exception as e:
             if "429" in str(e) or "quota" in str(e).lower():
                 time.sleep((tentativas + 1) * 10)
@@ -288,118 +146,158 @@ def extract_skills_from_description(description, titulo):
 
 # --- PROCESSAMENTO ---
 
-arquivo_csv = 'dados_vagas_linkedin.csv'
-print(f"📂 Lendo {arquivo_csv}...")
+def main(arquivo_csv='dados_vagas_linkedin.csv'):
+    import pandas as pd
+    from dotenv import load_dotenv
+    from tqdm import tqdm
+    from cubo import construir_cubo, salvar_cubo, ARQUIVO_CUBO
+    from tendencias import atualizar_tendencias, carregar_tendencias, salvar_tendencias, carregar_vistas, salvar_vistas
 
-try:
-    df = pd.read_csv(arquivo_csv)
-except FileNotFoundError:
-    print("Arquivo não encontrado!")
-    exit()
+    # Carrega API Key
+    load_dotenv()
+    if not os.getenv("GEMINI_API_KEY"):
+        print("ERRO: API Key não encontrada no .env")
+        return
 
-# Adicionei 'tipo_padronizado' nas colunas alvo
-colunas_alvo = ["cargo_simplificado", "senioridade_simplificada", "tipo_padronizado", "tech_stack", "educacao", "soft_skills", "cloud", "linguas"]
-for col in colunas_alvo:
-    if col not in df.columns:
-        df[col] = None
-    df[col] = df[col].astype(object)
+    print(f"📂 Lendo {arquivo_csv}...")
 
-print(f"🚀 Iniciando padronização e fusão de Tech+Cloud...")
+    try:
+        df = pd.read_csv(arquivo_csv)
+    except FileNotFoundError:
+        print("Arquivo não encontrado!")
+        return
 
-alteracoes = 0
+    # Adicionei 'tipo_padronizado' nas colunas alvo
+    colunas_alvo = ["cargo_simplificado", "senioridade_simplificada", "tipo_padronizado", "tech_stack", "educacao", "soft_skills", "cloud", "linguas"]
+    for col in colunas_alvo:
+        if col not in df.columns:
+            df[col] = None
+        df[col] = df[col].astype(object)
 
-for index, row in tqdm(df.iterrows(), total=df.shape[0]):
-    
-    # Verifica quais campos estão vazios
-    cargo_ok = str(row['cargo_simplificado']) not in ["None", "nan", "", "N/A"]
-    senior_ok = str(row['senioridade_simplificada']) not in ["None", "nan", "", "N/A"]
-    tipo_ok = str(row['tipo_padronizado']) not in ["None", "nan", "", "N/A"]
-    
-    titulo = str(row['titulo'])
-    local = str(row['local']) if 'local' in row else ""
-    descricao = str(row['descricao_raw'])
-    
-    # Pula se título ou descrição estão vazios
-    if pd.isna(titulo) or pd.isna(descricao) or len(descricao) < 10:
-        continue
-    
-    # --- PRÉ-PROCESSAMENTO: REGEX ANTES DA IA ---
-    
-    # 1. Tenta extrair CARGO do título por REGEX
-    if not cargo_ok:
-        cargo_regex = extract_cargo_from_title(titulo)
-        if cargo_regex:
-            df.at[index, 'cargo_simplificado'] = cargo_regex
-            cargo_ok = True
-            alteracoes += 1
-            print(f"✓ Cargo extraído por REGEX: {cargo_regex}")
-    
-    # 2. Tenta extrair SENIORIDADE do título por REGEX
-    if not senior_ok:
-        senioridade_regex = extract_senioridade_from_title(titulo)
-        if senioridade_regex:
-            df.at[index, 'senioridade_simplificada'] = senioridade_regex
-            senior_ok = True
-            alteracoes += 1
-            print(f"✓ Senioridade extraída por REGEX: {senioridade_regex}")
-    
-    # 3. Tenta extrair TIPO de trabalho do título ou local por REGEX
-    if not tipo_ok:
-        tipo_regex = extract_tipo_trabalho_from_text(f"{titulo} {local}")
-        if tipo_regex:
-            df.at[index, 'tipo_padronizado'] = tipo_regex
-            tipo_ok = True
-            alteracoes += 1
-            print(f"✓ Tipo de trabalho extraído por REGEX: {tipo_regex}")
-    
-    # --- ETAPA 1: Classifica pelo TÍTULO com IA (apenas se REGEX não conseguiu) ---
-    if not cargo_ok or not senior_ok:
-        print(f"\n📋 Analisando título com IA: {titulo[:50]}...")
-        dados_titulo = classify_from_title(titulo)
-        
-        if dados_titulo:
-            if not cargo_ok:
-                df.at[index, 'cargo_simplificado'] = dados_titulo.get('cargo_simplificado', 'Outros')
+    armazem = ArquivoDescricoes()
+
+    print(f"🚀 Iniciando padronização e fusão de Tech+Cloud...")
+
+    alteracoes = 0
+    dias_alterados = set()  # Dias de coleta com linhas enriquecidas (reagregados nas tendências)
+
+    for index, row in tqdm(df.iterrows(), total=df.shape[0]):
+        alteracoes_antes = alteracoes
+    
+        # Verifica quais campos estão vazios
+        cargo_ok = str(row['cargo_simplificado']) not in ["None", "nan", "", "N/A"]
+        senior_ok = str(row['senioridade_simplificada']) not in ["None", "nan", "", "N/A"]
+        tipo_ok = str(row['tipo_padronizado']) not in ["None", "nan", "", "N/A"]
+    
+        titulo = str(row['titulo'])
+        local = str(row['local']) if 'local' in row else ""
+        # CSV migrado não tem descricao_raw: lê só a descrição desta vaga do armazém
+        descricao = str(row['descricao_raw'] if 'descricao_raw' in row else armazem.ler(id_da_vaga(row['link'])))
+    
+        # Pula se título ou descrição estão vazios
+        if pd.isna(titulo) or pd.isna(descricao) or len(descricao) < 10:
+            continue
+    
+        # --- PRÉ-PROCESSAMENTO: REGEX ANTES DA IA ---
+    
+        # 1. Tenta extrair CARGO do título por REGEX
+        if not cargo_ok:
+            cargo_regex = extract_cargo_from_title(titulo)
+            if cargo_regex:
+                df.at[index, 'cargo_simplificado'] = cargo_regex
                 cargo_ok = True
-            if not senior_ok:
-                df.at[index, 'senioridade_simplificada'] = dados_titulo.get('senioridade_simplificada', 'N/A')
+                alteracoes += 1
+                print(f"✓ Cargo extraído por REGEX: {cargo_regex}")
+    
+        # 2. Tenta extrair SENIORIDADE do título por REGEX
+        if not senior_ok:
+            senioridade_regex = extract_senioridade_from_title(titulo)
+            if senioridade_regex:
+                df.at[index, 'senioridade_simplificada'] = senioridade_regex
                 senior_ok = True
-            alteracoes += 1
+                alteracoes += 1
+                print(f"✓ Senioridade extraída por REGEX: {senioridade_regex}")
+    
+        # 3. Tenta extrair TIPO de trabalho do título ou local por REGEX
+        if not tipo_ok:
+            tipo_regex = extract_tipo_trabalho_from_text(f"{titulo} {local}")
+            if tipo_regex:
+                df.at[index, 'tipo_padronizado'] = tipo_regex
+                tipo_ok = True
+                alteracoes += 1
+                print(f"✓ Tipo de trabalho extraído por REGEX: {tipo_regex}")
+    
+        # --- ETAPA 1: Classifica pelo TÍTULO com IA (apenas se REGEX não conseguiu) ---
+        if not cargo_ok or not senior_ok:
+            print(f"\n📋 Analisando título com IA: {titulo[:50]}...")
+            dados_titulo = classify_from_title(titulo)
+        
+            if dados_titulo:
+                # Só grava os campos que vieram válidos; os demais ficam para a próxima rodada
+                if not cargo_ok and 'cargo_simplificado' in dados_titulo:
+                    df.at[index, 'cargo_simplificado'] = dados_titulo['cargo_simplificado']
+                    cargo_ok = True
+                if not senior_ok and 'senioridade_simplificada' in dados_titulo:
+                    df.at[index, 'senioridade_simplificada'] = dados_titulo['senioridade_simplificada']
+                    senior_ok = True
+                alteracoes += 1
         
-        time.sleep(2)  # Pausa menor entre chamadas
+            time.sleep(2)  # Pausa menor entre chamadas
     
-    # --- ETAPA 2: Analisa DESCRIÇÃO para Skills e Tipo de Trabalho ---
-    # Verifica se precisa analisar a descrição
-    tech_ok = str(row['tech_stack']) not in ["None", "nan", "", "[]"]
+        # --- ETAPA 2: Analisa DESCRIÇÃO para Skills e Tipo de Trabalho ---
+        # Verifica se precisa analisar a descrição
+        tech_ok = str(row['tech_stack']) not in ["None", "nan", "", "[]"]
     
-    if not tipo_ok or not tech_ok:
-        print(f"🔍 Analisando descrição completa...")
-        dados_descricao = extract_skills_from_description(descricao, titulo)
+        if not tipo_ok or not tech_ok:
+            print(f"🔍 Analisando descrição completa...")
+            dados_descricao = extract_skills_from_description(descricao, titulo)
         
-        if dados_descricao:
-            if not tipo_ok:
-                df.at[index, 'tipo_padronizado'] = dados_descricao.get('tipo_padronizado', 'N/A')
-            
-            # Atualiza skills mesmo se já existir, para melhorar qualidade
-            skills = dados_descricao.get('tech_stack', [])
-            cloud_tools = dados_descricao.get('cloud', [])
-            
-            # Junta Cloud dentro de Tech Stack (sem duplicar)
-            tech_completa = list(set(skills + cloud_tools))
+            if dados_descricao:
+                if not tipo_ok and 'tipo_padronizado' in dados_descricao:
+                    df.at[index, 'tipo_padronizado'] = dados_descricao['tipo_padronizado']
             
-            df.at[index, 'tech_stack']  = str(tech_completa)
-            df.at[index, 'cloud']       = str(cloud_tools)
-            df.at[index, 'soft_skills'] = str(dados_descricao.get('soft_skills', []))
-            df.at[index, 'educacao']    = dados_descricao.get('educacao', 'N/A')
-            df.at[index, 'linguas']     = str(dados_descricao.get('linguas', []))
-            alteracoes += 1
+                # Atualiza skills mesmo se já existir, para melhorar qualidade
+                # (campo que não veio válido mantém o valor atual da linha)
+                if 'tech_stack' in dados_descricao or 'cloud' in dados_descricao:
+                    skills = dados_descricao['tech_stack'] if 'tech_stack' in dados_descricao else limpar_lista(row['tech_stack'])
+                    cloud_tools = dados_descricao['cloud'] if 'cloud' in dados_descricao else limpar_lista(row['cloud'])
+                
+                    # Junta Cloud dentro de Tech Stack (sem duplicar)
+                    df.at[index, 'tech_stack'] = str(mesclar_skills(skills, cloud_tools))
+                    if 'cloud' in dados_descricao:
+                        df.at[index, 'cloud'] = str(cloud_tools)
+                for campo in ['soft_skills', 'linguas']:
+                    if campo in dados_descricao:
+                        df.at[index, campo] = str(dados_descricao[campo])
+                if 'educacao' in dados_descricao:
+                    df.at[index, 'educacao'] = dados_descricao['educacao']
+                alteracoes += 1
         
-        time.sleep(4)  # Pausa maior após análise completa
+            time.sleep(4)  # Pausa maior após análise completa
     
-    # Salva checkpoint a cada 5 vagas
-    if index % 5 == 0:
-        df.to_csv(arquivo_csv, index=False)
-        print(f"💾 Checkpoint salvo ({alteracoes} alterações até agora)")
+        if alteracoes > alteracoes_antes and not pd.isna(row['data_coleta']):
+            dias_alterados.add(row['data_coleta'])
+
+        # Salva checkpoint a cada 5 vagas
+        if index % 5 == 0:
+            df.to_csv(arquivo_csv, index=False)
+            print(f"💾 Checkpoint salvo ({alteracoes} alterações até agora)")
+
+    df.to_csv(arquivo_csv, index=False)
+    print(f"\n✅ Concluído! {alteracoes} linhas foram atualizadas.")
+    if falhas_por_campo:
+        print(f"⚠️ Falhas de parse por campo: {dict(falhas_por_campo)}")
+
+    # Materializa o cubo de agregados usado pelo dashboard
+    salvar_cubo(construir_cubo(df))
+    print(f"🧊 Cubo de filtros salvo em {ARQUIVO_CUBO}")
+
+    # Reagrega nas tendências só os dias cujas linhas mudaram com o enriquecimento
+    tendencias, vistas = carregar_tendencias(), carregar_vistas()
+    dias = atualizar_tendencias(df, tendencias, vistas, dias_alterados)
+    salvar_tendencias(tendencias)
+    salvar_vistas(vistas)
+    print(f"📈 Tendências atualizadas ({len(dias)} dia(s) reagregado(s))")
 
-df.to_csv(arquivo_csv, index=False)
-print(f"\n✅ Concluído! {alteracoes} linhas foram atualizadas.")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
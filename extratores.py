@@ -0,0 +1,134 @@
+import re
+
+# --- FUNÇÕES DE EXTRAÇÃO POR REGEX (Executam ANTES da IA) ---
+# As tabelas de padrões ficam no nível do módulo e são compiladas uma única vez
+# (um regex por categoria), então cada processo do backfill as carrega só no import.
+
+# Padrões de cargos (português e inglês)
+CARGOS_MAP = {
+    'Data Engineer': [
+        r'data\s*engineer',
+        r'engenh[ea]ir[oa]\s*(?:\(a\))?\s*de\s*dados',  # Captura Engenheiro(a), Engenheira, Engenheiro
+        r'eng\.?\s*(?:\(a\))?\s*dados',  # Eng. Dados ou Eng(a) Dados
+        r'data\s*platform\s*engineer'
+    ],
+    'Data Scientist': [
+        r'data\s*scientist',
+        r'cientista\s*de\s*dados',
+        r'data\s*science(?!\s*engineer)'  # Evita pegar "Data Science Engineer"
+    ],
+    'Machine Learning Engineer': [
+        r'machine\s*learning\s*engineer',
+        r'ml\s*engineer',
+        r'mlops\s*engineer',
+        r'ai\s*engineer',
+        r'artificial\s*intelligence\s*engineer'
+    ],
+    'Analytics Engineer': [
+        r'analytics\s*engineer',
+        r'engenh[ea]ir[oa]\s*(?:\(a\))?\s*de\s*analytics',
+        r'bi\s*engineer'
+    ],
+    'Data Analyst': [
+        r'data\s*analyst',
+        r'analista\s*de\s*dados',
+        r'business\s*intelligence\s*analyst',
+        r'bi\s*analyst'
+    ],
+    'Software Engineer': [
+        r'software\s*engineer',
+        r'engenh[ea]ir[oa]\s*(?:\(a\))?\s*de\s*software',
+        r'backend\s*engineer',
+        r'full\s*stack',
+        r'fullstack'
+    ]
+}
+
+# Padrões de senioridade (português e inglês) - ordem importa (mais específico primeiro)
+SENIORIDADE_PATTERNS = {
+    'Estágio': [
+        r'\bintern\b',
+        r'\btrainee\b',
+        r'\bestag',
+        r'\bestagiário\b'
+    ],
+    'Junior': [
+        r'\bjr\.?\b',  # Jr ou Jr.
+        r'\bjunior\b',
+        r'\bjúnior\b',
+        r'\bi\b(?!\s*\w)',  # I isolado
+        r'\bj[úu]nior\b'  # Aceita júnior e junior
+    ],
+    'Pleno': [
+        r'\bpleno\b',
+        r'\bmid\b',
+        r'\bpl\b',  # PL (case insensitive por causa do .lower())
+        r'\bmid-level\b',
+        r'\bmidlevel\b',
+        r'\bii\b',
+        r'\biii\b'
+    ],
+    'Senior': [
+        r'\bsenior\b',
+        r'\bs[êe]nior\b',  # Aceita sênior e senior
+        r'\bsr\.?\b',  # Sr ou Sr.
+        r'\biv\b',
+        r'\bv\b'
+    ],
+    'Especialista': [
+        r'\bstaff\b',
+        r'\bprincipal\b',
+        r'\blead\b',
+        r'\bexpert\b',
+        r'\bspecialist\b',
+        r'\bespecialista\b',
+        r'\barchitect\b'
+    ],
+    'Gestão': [
+        r'\bmanager\b',
+        r'\bgerente\b',
+        r'\bhead\b',
+        r'\bdirector\b',
+        r'\bdiretor\b',
+        r'\bvp\b',
+        r'\bchief\b'
+    ]
+}
+
+# Padrões de tipo de trabalho
+TIPO_TRABALHO_PATTERNS = {
+    'Remoto': [r'\b(remote|remoto|100%\s*remote|work\s*from\s*home|wfh|anywhere|fully\s*remote)\b'],
+    'Híbrido': [r'\b(hybrid|híbrido|hibrido|flex)\b'],
+    'Presencial': [r'\b(on-site|onsite|presencial|in-office|office)\b'],
+}
+
+def _compilar(tabela):
+    """Junta os padrões de cada categoria em um único regex (a ordem das categorias é mantida)"""
+    return [(categoria, re.compile('|'.join(f'(?:{p})' for p in patterns))) for categoria, patterns in tabela.items()]
+
+_CARGOS = _compilar(CARGOS_MAP)
+_SENIORIDADES = _compilar(SENIORIDADE_PATTERNS)
+_TIPOS_TRABALHO = _compilar(TIPO_TRABALHO_PATTERNS)
+
+def _primeira_categoria(compilados, texto):
+    texto_lower = texto.lower()
+    for categoria, regex in compilados:
+        if regex.search(texto_lower):
+            return categoria
+    return None  # Retorna None se não encontrar
+
+def extract_cargo_from_title(titulo):
+    """Extrai cargo do título usando REGEX antes de chamar IA"""
+    return _primeira_categoria(_CARGOS, titulo)
+
+def extract_senioridade_from_title(titulo):
+    """Extrai senioridade do título usando REGEX antes de chamar IA"""
+    return _primeira_categoria(_SENIORIDADES, titulo)
+
+def extract_tipo_trabalho_from_text(texto):
+    """Extrai tipo de trabalho (Remoto/Híbrido/Presencial) de título ou local usando REGEX"""
+    return _primeira_categoria(_TIPOS_TRABALHO, texto)
+
+def mesclar_skills(skills, cloud_tools):
+    """Junta Cloud dentro de Tech Stack sem duplicar, mantendo a ordem (resultado determinístico)"""
+    return list(dict.fromkeys(skills + cloud_tools))
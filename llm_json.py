@@ -0,0 +1,134 @@
+import json
+import re
+import typing
+from collections import Counter
+from functools import lru_cache
+from typing import TypedDict
+
+# orjson é bem mais rápido que o json da stdlib; se não estiver instalado, cai no json normal
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+_decoder = json.JSONDecoder()
+
+# Modelo com suporte a response_mime_type/response_schema (o 'gemini-pro' antigo não aceita JSON mode)
+MODELO_JSON = 'models/gemini-flash-latest'
+
+# --- SCHEMAS TIPADOS (usados no JSON mode do Gemini e na validação) ---
+
+class ExtracaoTitulo(TypedDict):
+    cargo_simplificado: str
+    senioridade_simplificada: str
+
+class ExtracaoDescricao(TypedDict):
+    tipo_padronizado: str
+    tech_stack: list[str]
+    cloud: list[str]
+    soft_skills: list[str]
+    educacao: str
+    linguas: list[str]
+
+class ExtracaoVaga(TypedDict):
+    nivel_senioridade: str
+    tech_stack: list[str]
+    educacao: str
+    tipo_trabalho: str
+    soft_skills: list[str]
+    ferramentas_cloud: list[str]
+    linguas: list[str]
+
+class Keywords(TypedDict):
+    keywords: list[str]
+
+# Contadores de falha por campo ("Schema.campo") e de respostas sem nenhum JSON aproveitável
+falhas_por_campo = Counter()
+
+# Tipos dos campos dos schemas no formato de schema do Gemini
+_TIPOS_JSON = {str: {"type": "string"}, list[str]: {"type": "array", "items": {"type": "string"}}}
+
+def json_generation_config(schema, **extra):
+    """Monta generation_config pedindo resposta em JSON restrita ao schema.
+
+    O schema vai como dict explícito: passar a classe faz a SDK validá-la com pydantic, que
+    recusa typing.TypedDict antes do Python 3.12 (e typing_extensions custa ~12 ms no import).
+    """
+    tipos, _ = _campos(schema)
+    response_schema = {
+        "type": "object",
+        "properties": {campo: dict(_TIPOS_JSON[tipo]) for campo, tipo in tipos.items()},
+        "required": list(tipos),
+    }
+    return {"response_mime_type": "application/json", "response_schema": response_schema, **extra}
+
+@lru_cache(maxsize=None)
+def _campos(schema):
+    """Tipos e regex de salvamento de cada campo do schema (calculado uma vez por schema)"""
+    tipos = typing.get_type_hints(schema)
+    padroes = {campo: re.compile(rf'"{re.escape(campo)}"\s*:\s*') for campo in tipos}
+    return tipos, padroes
+
+def _decode_objeto(texto):
+    """Decodifica o objeto JSON da resposta (JSON puro, com cerca ```json ou com texto em volta)"""
+    try:
+        obj = _loads(texto)
+        return obj if isinstance(obj, dict) else None
+    except ValueError:
+        pass
+    # Decodifica a partir do primeiro '{' e para no fim do objeto (sem regex gulosa)
+    inicio = texto.find('{')
+    if inicio == -1: return None
+    try:
+        obj, _ = _decoder.raw_decode(texto, inicio)
+        return obj if isinstance(obj, dict) else None
+    except ValueError:
+        return None
+
+def _salvar_campos(texto, padroes):
+    """Recupera os pares campo/valor completos de um JSON truncado ou malformado"""
+    encontrados = {}
+    for campo, padrao in padroes.items():
+        match = padrao.search(texto)
+        if not match: continue
+        try:
+            encontrados[campo], _ = _decoder.raw_decode(texto, match.end())
+        except ValueError:
+            continue
+    return encontrados
+
+def _validar(valor, tipo):
+    """Retorna o valor convertido para o tipo do campo, ou None se for inválido"""
+    if tipo is str:
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool): valor = str(valor)
+        return valor.strip() if isinstance(valor, str) and valor.strip() else None
+    # list[str]: aceita string solta como lista de um item e descarta itens vazios
+    if isinstance(valor, str): valor = [valor]
+    if not isinstance(valor, list): return None
+    return [str(item).strip() for item in valor if item is not None and str(item).strip()]
+
+def parse_llm_json(response_text, schema):
+    """Faz o parse da resposta da IA contra o schema, mantendo apenas os campos válidos.
+
+    Retorna um dict (vazio se nada for aproveitável). Campos ausentes ou com tipo
+    errado são contabilizados em `falhas_por_campo`.
+    """
+    tipos, padroes = _campos(schema)
+    if not response_text:
+        falhas_por_campo[f"{schema.__name__}.<vazio>"] += 1
+        return {}
+
+    dados = _decode_objeto(response_text)
+    if dados is None:
+        dados = _salvar_campos(response_text, padroes)
+        if not dados: falhas_por_campo[f"{schema.__name__}.<json_invalido>"] += 1
+
+    resultado = {}
+    for campo, tipo in tipos.items():
+        valor = _validar(dados[campo], tipo) if campo in dados else None
+        if valor is None:
+            falhas_por_campo[f"{schema.__name__}.{campo}"] += 1
+        else:
+            resultado[campo] = valor
+    return resultado
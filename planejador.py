@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from llm_json import parse_llm_json, json_generation_config, MODELO_JSON, Keywords
+
+# Planejador de buscas do scraper: expande (cargo, nível) em keywords com cache, aprende com
+# as execuções anteriores quais queries trazem vagas NOVAS e monta um plano priorizado
+# (local x keyword) sem duplicatas, descartando as queries de baixo rendimento. O histórico
+# decai a cada execução (o rendimento recente pesa mais) e as queries descartadas voltam
+# ao plano de tempos em tempos para serem reavaliadas.
+
+ARQUIVO_CACHE_KEYWORDS = 'cache_keywords.json'
+ARQUIVO_HISTORICO = 'historico_buscas.json'
+ARQUIVO_PLANO = 'plano_buscas.json'
+
+EXECUCOES_MINIMAS = 1.5    # Só descarta uma query depois de vê-la rodar algumas vezes (2 execuções com decaimento)
+RENDIMENTO_MINIMO = 1.0    # Vagas novas por execução abaixo disso => query descartada
+RENDIMENTO_PADRAO = 25.0   # Otimista para queries nunca executadas (~1 página de resultados)
+PESO_PRIORI = 1.0          # Quantas "execuções fictícias" a estimativa a priori vale
+DECAIMENTO = 0.7           # Peso das execuções anteriores a cada nova execução
+DIAS_REEXPLORACAO = 7      # Query descartada volta ao plano depois desse tempo sem rodar
+
+def _ler_json(caminho, padrao):
+    try:
+        with open(caminho, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return padrao
+
+def _salvar_json(dados, caminho):
+    with open(caminho, 'w', encoding='utf-8') as file:
+        json.dump(dados, file, ensure_ascii=False, indent=2)
+
+def _chave_cargo(role, level):
+    return f"{role.strip().lower()}|{(level or '').strip().lower()}"
+
+def chave_query(location, keyword):
+    return f"{location.strip().lower()}|{' '.join(keyword.split()).lower()}"
+
+# --- GERAÇÃO DE KEYWORDS (IA) ---
+
+def gerar_keywords_ia(role, level):
+    """Pede à IA variações de busca do cargo (com ou sem nível)"""
+    import google.generativeai as genai  # Só importa (e configura) quando o cache não resolve
+
+    print(f"🧠 IA gerando keywords para: {role} ({level or 'Geral'})...")
+
+    if not level:
+        # Prompt SEM nível específico (Busca genérica pelo cargo)
+        prompt = f"""Atue como Recrutador Tech. Gere lista de keywords de busca para Linkedin.
+        Cargo: '{role}'
+
+        REQUISITOS:
+        1. Gere variações APENAS do nome do cargo em PT e EN (ex: Data Engineer, Engenheiro de Dados).
+        2. Inclua siglas comuns se houver (ex: ML Engineer).
+        3. NÃO adicione termos de senioridade (Junior, Pleno, Senior, I, II, III). Queremos ver todas as vagas.
+        4. Gere 5 a 8 termos variantes do cargo.
+
+        Retorne JSON: {{"keywords": ["Termo 1", "Termo 2"]}}"""
+    else:
+        # Prompt COM nível específico
+        prompt = f"""Atue como Recrutador Tech. Gere lista de keywords de busca para Linkedin.
+        Cargo: '{role}'
+        Nível: '{level}'
+
+        REQUISITOS:
+        1. Gere variações do cargo em PT e EN combinadas com o nível.
+        2. Use sinônimos do nível (ex: Se '{level}' for Junior -> usar Jr, I, Entry Level).
+        3. Exemplo: Data Engineer {level}, Engenheiro de Dados {level}, Data Engineer (I/II/III conforme o nível).
+        4. Gere 5 a 10 termos combinados.
+
+        Retorne JSON: {{"keywords": ["Termo 1", "Termo 2"]}}"""
+
+    try:
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        model = genai.GenerativeModel(MODELO_JSON)
+        config = json_generation_config(Keywords, max_output_tokens=2048, temperature=0.0)
+        result = model.generate_content(prompt, generation_config=config).text
+    except Exception as e:
+        print(f"⚠️ Erro ao gerar keywords: {e}")
+        result = None
+    return parse_llm_json(result, Keywords).get("keywords")
+
+def expandir_keywords(pares, caminho_cache=ARQUIVO_CACHE_KEYWORDS):
+    """Keywords de cada (cargo, nível), usando o cache e chamando a IA em paralelo só para o que falta"""
+    cache = _ler_json(caminho_cache, {})
+    faltando = list({_chave_cargo(r, l): (r, l) for r, l in pares if _chave_cargo(r, l) not in cache}.values())
+
+    if faltando:
+        with ThreadPoolExecutor(max_workers=len(faltando)) as executor:
+            gerados = list(executor.map(lambda par: gerar_keywords_ia(*par), faltando))
+        for (role, level), keywords in zip(faltando, gerados):
+            # Falha da IA não entra no cache (para tentar de novo na próxima vez)
+            if keywords: cache[_chave_cargo(role, level)] = keywords
+        _salvar_json(cache, caminho_cache)
+
+    return {(role, level): cache.get(_chave_cargo(role, level)) or [role] for role, level in pares}
+
+# --- HISTÓRICO DE RENDIMENTO ---
+
+def carregar_historico(caminho=ARQUIVO_HISTORICO):
+    return _ler_json(caminho, {})
+
+def registrar_resultado(historico, location, keyword, vistas, novas, caminho=ARQUIVO_HISTORICO):
+    """Soma o resultado de uma execução da query (vagas listadas e vagas ainda não coletadas).
+
+    Os totais anteriores são multiplicados por DECAIMENTO antes da soma, então uma query que
+    rendeu bem há muito tempo e parou de render perde prioridade (e vice-versa).
+    """
+    stats = historico.setdefault(chave_query(location, keyword), {"execucoes": 0, "vistas": 0, "novas": 0})
+    for campo, valor in [("execucoes", 1), ("vistas", vistas), ("novas", novas)]:
+        stats[campo] = round(stats[campo] * DECAIMENTO + valor, 4)
+    stats["ultima_execucao"] = datetime.now().isoformat(timespec='seconds')
+    _salvar_json(historico, caminho)
+
+def _rendimento_medio(historico):
+    execucoes = sum(s["execucoes"] for s in historico.values())
+    return sum(s["novas"] for s in historico.values()) / execucoes if execucoes else RENDIMENTO_PADRAO
+
+def _descartada(stats, agora):
+    """Baixo rendimento recente, a menos que já esteja na hora de reavaliar a query"""
+    if stats["execucoes"] < EXECUCOES_MINIMAS or stats["novas"] / stats["execucoes"] >= RENDIMENTO_MINIMO:
+        return False
+    ultima = stats.get("ultima_execucao")
+    return ultima is not None and agora - datetime.fromisoformat(ultima) < timedelta(days=DIAS_REEXPLORACAO)
+
+def _ranquear(pares, historico, agora=None):
+    """(plano ordenado pelo rendimento esperado, queries descartadas) para os pares (local, keyword)"""
+    agora = agora or datetime.now()
+    # Queries nunca executadas herdam o maior entre o rendimento médio observado e o padrão,
+    # para sempre serem testadas ao menos algumas vezes
+    priori = max(_rendimento_medio(historico), RENDIMENTO_PADRAO)
+    plano, descartadas, vistas = [], [], set()
+    for location, keyword in pares:
+        chave = chave_query(location, keyword)
+        if chave in vistas: continue
+        vistas.add(chave)
+
+        stats = historico.get(chave, {"execucoes": 0, "novas": 0})
+        esperado = (stats["novas"] + PESO_PRIORI * priori) / (stats["execucoes"] + PESO_PRIORI)
+        query = {"location": location, "keyword": ' '.join(keyword.split()), "prioridade": round(esperado, 2)}
+        (descartadas if _descartada(stats, agora) else plano).append(query)
+
+    return sorted(plano, key=lambda query: -query["prioridade"]), descartadas
+
+def montar_plano(locations, keywords, historico):
+    """Plano de buscas (local x keyword) sem duplicatas, ordenado pelo rendimento esperado"""
+    return _ranquear([(location, keyword) for location in locations for keyword in keywords], historico)[0]
+
+def replanejar(plano, historico):
+    """Reordena um plano salvo com o histórico atual (o scraper chama a cada execução)"""
+    return _ranquear([(query['location'], query['keyword']) for query in plano], historico)[0]
+
+def carregar_plano(caminho=ARQUIVO_PLANO):
+    return _ler_json(caminho, [])
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o plano de buscas do scraper sem interação")
+    parser.add_argument('cargos', nargs='+', help='Cargo e nível opcional no formato "Cargo[:Nível]" (ex: "Engenheiro de Dados:Pleno")')
+    parser.add_argument('--locais', nargs='+', help="Locais de busca (padrão: 'locations' do config.json ou Brazil)")
+    parser.add_argument('--config', default='config.json')
+    parser.add_argument('--limite', type=int, help="Número máximo de queries no plano")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    locations = args.locais or _ler_json(args.config, {}).get('locations', ["Brazil"])
+    pares = [tuple(parte.strip() for parte in (cargo.split(':', 1) if ':' in cargo else [cargo, ''])) for cargo in args.cargos]
+    expansoes = expandir_keywords(pares)
+    keywords = [keyword for par in pares for keyword in expansoes[par]]
+    for (role, level), kws in expansoes.items():
+        print(f"🔍 {role} ({level or 'Geral'}): {kws}")
+
+    plano, descartadas = _ranquear([(location, keyword) for location in locations for keyword in keywords], carregar_historico())
+    if args.limite: plano = plano[:args.limite]
+    # As descartadas ficam no arquivo: o scraper re-ranqueia o plano a cada execução e elas
+    # voltam sozinhas quando passar DIAS_REEXPLORACAO
+    _salvar_json(plano + descartadas, ARQUIVO_PLANO)
+    print(f"✅ Plano com {len(plano)} buscas salvo em {ARQUIVO_PLANO} ({len(descartadas)} descartadas por baixo rendimento)")
+    for query in plano[:10]:
+        print(f"  {query['prioridade']:>6} | {query['location']} | {query['keyword']}")
+
+if __name__ == "__main__":
+    main()
@@ -4,137 +4,99 @@ import traceback
 import warnings
 import json
 import os
-import pandas as pd
-import re
 import sys
 from datetime import datetime
 
-# Imports Selenium
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
+# Selenium, pandas e a SDK do Gemini são importados só onde são usados: assim o módulo
+# pode ser importado (testes, benchmark, planejador) sem custo e sem efeitos colaterais
+from busca import abrir_indice, indexar_vaga, id_da_vaga
+from descricoes import ArquivoDescricoes
+from llm_json import parse_llm_json, json_generation_config, MODELO_JSON, ExtracaoVaga
+from planejador import expandir_keywords, montar_plano, replanejar, carregar_plano, carregar_historico, registrar_resultado, ARQUIVO_PLANO
+from sessao import SessaoScraper, descartar_sessao, carregar_cookies, salvar_cookies
 
-# IA e Env
-import google.generativeai as genai
-from dotenv import load_dotenv
-
-load_dotenv()
-warnings.filterwarnings('ignore')
-
-# Segredos (Só precisamos da API KEY agora, o login vc faz na mão)
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-
-if not gemini_api_key:
-    print("ERRO: Faltando API Key no .env")
-    sys.exit()
-
-# --- FUNÇÕES IA (Movidas para cima para uso na config) ---
-def ask_ia(prompt):
+# --- FUNÇÕES IA ---
+def ask_ia(prompt, schema):
+    """Chama a IA em JSON mode (restrito ao schema) e devolve os campos válidos"""
+    import google.generativeai as genai
     try:
-        genai.configure(api_key=gemini_api_key)
-        model = genai.GenerativeModel('gemini-pro')
-        result = model.generate_content(prompt, generation_config=genai.types.GenerationConfig(max_output_tokens=2048, temperature=0.0)).text
-        return result
-    except: return None
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        model = genai.GenerativeModel(MODELO_JSON)
+        config = json_generation_config(schema, max_output_tokens=2048, temperature=0.0)
+        result = model.generate_content(prompt, generation_config=config).text
+    except Exception as e:
+        print(f"⚠️ Erro na chamada da IA: {e}")
+        result = None
+    return parse_llm_json(result, schema)
 
-def clean_json_response(response_text):
+# --- CONFIGURAÇÃO INICIAL ---
+def carregar_config(config_path='config.json'):
+    """Lê o config.json (locations, remote, hybrid, paginas, keywords), com padrões se não existir"""
+    config = {"locations": ["Brazil"], "remote": True, "hybrid": True, "paginas": 1}
     try:
-        if not response_text: return None
-        match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-        json_str = match.group(1) if match else re.search(r'\{.*\}', response_text, re.DOTALL).group(0)
-        return json.loads(json_str)
-    except: return None
-
-# --- CONFIGURAÇÃO INICIAL (Interativa) ---
-try:
-    config_path = 'config.json'
-    if len(sys.argv) > 1:
-        config_path = f'{sys.argv[1]}.json'
-        
-    with open(config_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-        # Ignora keywords do json pois faremos interativo
-        for key in data: 
-            if key != 'keywords': globals()[key] = data[key]
-            
-    if 'locations' not in globals(): globals()['locations'] = ["Brazil"]
-    if 'remote' not in globals(): globals()['remote'] = True
-    if 'hybrid' not in globals(): globals()['hybrid'] = True
-        
-except Exception as e:
-    print(f"Aviso: Não foi possível carregar {config_path}. Usando configurações padrão.")
-    globals()['locations'] = ["Brazil"]
-    globals()['remote'] = True
-    globals()['hybrid'] = True
-
-# --- GERAÇÃO DE KEYWORDS ---
-print("\n" + "="*50)
-print("🤖 JOB HUNTER AI - CONFIGURAÇÃO DE BUSCA")
-print("="*50)
-try:
+        with open(config_path, 'r', encoding='utf-8') as file:
+            config.update(json.load(file))
+    except Exception as e:
+        print(f"Aviso: Não foi possível carregar {config_path}. Usando configurações padrão.")
+    return config
+
+def montar_plano_interativo(config):
+    """Pergunta cargo/nível no terminal e monta o plano de buscas (modo sem planejador.py)"""
+    print("\n" + "="*50)
+    print("🤖 JOB HUNTER AI - CONFIGURAÇÃO DE BUSCA")
+    print("="*50)
     target_role = input("Digite o CARGO desejado (ex: Engenheiro de Dados): ").strip()
     target_level = input("Digite o NÍVEL de experiência (ex: Junior, Pleno, Senior): ").strip()
-except KeyboardInterrupt:
-    sys.exit()
-
-def generate_search_keywords(role, level):
-    print(f"\n🧠 IA gerando keywords para: {role} ({level or 'Geral'})...")
-    
-    if not level:
-        # Prompt SEM nível específico (Busca genérica pelo cargo)
-        prompt = f"""Atue como Recrutador Tech. Gere lista de keywords de busca para Linkedin.
-        Cargo: '{role}'
-        
-        REQUISITOS:
-        1. Gere variações APENAS do nome do cargo em PT e EN (ex: Data Engineer, Engenheiro de Dados).
-        2. Inclua siglas comuns se houver (ex: ML Engineer).
-        3. NÃO adicione termos de senioridade (Junior, Pleno, Senior, I, II, III). Queremos ver todas as vagas.
-        4. Gere 5 a 8 termos variantes do cargo.
-        
-        Retorne JSON: {{"keywords": ["Termo 1", "Termo 2"]}}"""
-    else:
-        # Prompt COM nível específico
-        prompt = f"""Atue como Recrutador Tech. Gere lista de keywords de busca para Linkedin.
-        Cargo: '{role}'
-        Nível: '{level}'
-        
-        REQUISITOS:
-        1. Gere variações do cargo em PT e EN combinadas com o nível.
-        2. Use sinônimos do nível (ex: Se '{level}' for Junior -> usar Jr, I, Entry Level).
-        3. Exemplo: Data Engineer {level}, Engenheiro de Dados {level}, Data Engineer (I/II/III conforme o nível).
-        4. Gere 5 a 10 termos combinados.
-        
-        Retorne JSON: {{"keywords": ["Termo 1", "Termo 2"]}}"""
-    
-    res = ask_ia(prompt)
-    if res:
-        clean = clean_json_response(res)
-        if clean and "keywords" in clean: return clean["keywords"]
-    return [role]
-
-if target_role:
-    keywords = generate_search_keywords(target_role, target_level)
-    print(f"🔍 Keywords Geradas: {keywords}")
-else:
-    print("⚠️ Nenhum cargo digitado. Usando arquivo config...")
-    if 'keywords' in globals(): pass 
-    elif 'keywords' in data: keywords = data['keywords']
-    else: keywords = ["Data Engineer"] # Fallback
-
-print("="*50 + "\n")
 
+    if target_role:
+        # Expansão de keywords com cache por (cargo, nível): só chama a IA na primeira vez
+        keywords = expandir_keywords([(target_role, target_level)])[(target_role, target_level)]
+        print(f"🔍 Keywords Geradas: {keywords}")
+    else:
+        print("⚠️ Nenhum cargo digitado. Usando arquivo config...")
+        keywords = config.get('keywords') or ["Data Engineer"] # Fallback
 
+    # Prioriza as queries que mais trouxeram vagas novas e descarta as de baixo rendimento
+    plano = montar_plano(config['locations'], keywords, carregar_historico())
+    print("="*50 + "\n")
+    return plano
 
 def get_extraction_prompt(description):
     return f"""Atue como Recrutador Tech. Extraia dados em JSON da descrição: {description[:8000]}
     JSON ESPERADO: {{"nivel_senioridade": "Texto", "tech_stack": ["Lista"], "educacao": "Texto", "tipo_trabalho": "Texto", "soft_skills": ["Lista"], "ferramentas_cloud": ["Lista"], "linguas": ["Lista"]}}"""
 
+# --- RESILIÊNCIA DO DRIVER ---
+VAGAS_POR_PAGINA = 25      # Tamanho da página de resultados do LinkedIn (parâmetro &start=)
+MAX_REINICIOS = 5          # Reinícios seguidos do driver sem nenhum progresso antes de desistir
+MENSAGENS_FATAIS = ['invalid session id', 'session deleted', 'chrome not reachable', 'disconnected', 'no such window', 'target window already closed', 'tab crashed']
+
+def erro_fatal(e):
+    """True se o erro indica driver/navegador morto (reiniciar), e não só um card com problema"""
+    from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, TimeoutException, WebDriverException
+    from urllib3.exceptions import MaxRetryError, ProtocolError
+
+    # TimeoutException aqui é o driver.get travado (página que não carrega): navegador novo resolve
+    if isinstance(e, (InvalidSessionIdException, NoSuchWindowException, TimeoutException, MaxRetryError, ProtocolError, ConnectionError)):
+        return True
+    return isinstance(e, WebDriverException) and any(msg in str(e).lower() for msg in MENSAGENS_FATAIS)
+
 # --- CLASSE PRINCIPAL ---
 class LinkedinScraper:
-    def __init__(self):
-        
+    def __init__(self, plano, remote=True, hybrid=True, paginas=1):
+        self.plano = plano
+        self.remote = remote
+        self.hybrid = hybrid
+        self.paginas = paginas
+        self.driver = None
+        self.cookies = carregar_cookies()
+        self.iniciar_driver()
+
+    def _criar_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+        from webdriver_manager.chrome import ChromeDriverManager
+
         options = Options()
         
         # --- MODO VISUAL (COM TELA) ---
@@ -150,8 +112,19 @@ class LinkedinScraper:
         
         print("Iniciando navegador...")
         service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
-        
+        return webdriver.Chrome(service=service, options=options)
+
+    def _restaurar_login(self):
+        """Reaproveita os cookies do último login (janela anônima nova não tem sessão)"""
+        self.driver.get('https://www.linkedin.com')
+        for cookie in self.cookies:
+            try: self.driver.add_cookie({k: v for k, v in cookie.items() if k != 'sameSite'})
+            except: pass
+        self.driver.get('https://www.linkedin.com/feed/')
+        time.sleep(random.uniform(3, 5))
+        return not any(parte in self.driver.current_url for parte in ['/login', '/authwall', '/checkpoint'])
+
+    def _login_manual(self):
         # --- LOGIN SEMI-AUTOMÁTICO ---
         print("Abrindo página de Login...")
         self.driver.get('https://www.linkedin.com/login')
@@ -168,82 +141,214 @@ class LinkedinScraper:
         
         print("Retomando automação...")
 
-    def scrape_jobs(self):
-        global locations, keywords, remote, hybrid
+    def iniciar_driver(self):
+        """Abre o navegador e loga (com os cookies salvos quando possível; senão, login manual)"""
+        if self.driver is not None:
+            try: self.driver.quit()
+            except: pass
+        self.driver = self._criar_driver()
+        if self.cookies and self._restaurar_login():
+            print("🔑 Sessão do LinkedIn restaurada com os cookies salvos.")
+            return
+        self._login_manual()
+        self.cookies = self.driver.get_cookies()
+        salvar_cookies(self.cookies)
+
+    def scrape_jobs(self, sessao=None):
+        """Executa o plano pelo journal da sessão, reiniciando o driver se ele cair"""
+        sessao = sessao or SessaoScraper(self.plano)
+        reinicios, progresso, reiniciar = 0, sessao.progresso(), False
+        while True:
+            try:
+                if reiniciar:
+                    self.iniciar_driver()
+                    reiniciar = False
+                self._executar_plano(sessao)
+                break
+            except Exception as e:
+                if not erro_fatal(e): raise
+                # Reinícios só contam enquanto nada avança: se houve progresso, zera o contador
+                if sessao.progresso() != progresso: reinicios, progresso = 0, sessao.progresso()
+                reinicios += 1
+                if reinicios > MAX_REINICIOS: raise
+                print(f"♻️ Driver caiu ({type(e).__name__}). Reiniciando ({reinicios}/{MAX_REINICIOS}) e retomando do journal...")
+                time.sleep(random.uniform(5, 10))
+                reiniciar = True
+        print(f"🏁 Sessão concluída: {sessao.resumo()}")
+
+    def _executar_plano(self, sessao):
+        import pandas as pd
+        from selenium.webdriver.common.by import By
+
+        remote, hybrid = self.remote, self.hybrid
         output_file = 'dados_vagas_linkedin.csv'
         
         if not os.path.isfile(output_file):
-            pd.DataFrame(columns=["data_coleta", "titulo", "empresa", "local", "link", "tech_stack", "educacao", "tipo", "soft_skills", "cloud", "linguas", "descricao_raw"]).to_csv(output_file, index=False)
+            # A descrição vai para o armazém comprimido (descricoes.py), não para o CSV
+            pd.DataFrame(columns=["data_coleta", "titulo", "empresa", "local", "link", "tech_stack", "educacao", "tipo", "soft_skills", "cloud", "linguas"]).to_csv(output_file, index=False)
+        # Linhas novas seguem o cabeçalho do CSV (CSV antigo ainda pode ter descricao_raw)
+        colunas_csv = pd.read_csv(output_file, nrows=0).columns.tolist()
 
-        job_ids_scraped = [] 
+        # Vagas já coletadas em execuções anteriores não são abertas de novo
+        job_ids_scraped = {str(id_da_vaga(link)) for link in pd.read_csv(output_file, usecols=['link'])['link']}
+        indice = abrir_indice()
+        armazem = ArquivoDescricoes()
+        historico = carregar_historico()
 
-        for location in locations:
-            print(f"--- Buscando em: {location} ---")
-            for keyword in keywords:
-                print(f"Keyword: {keyword}")
-                f_WT = "&f_WT=1%2C2" if remote and hybrid else ("&f_WT=2" if remote else ("&f_WT=1" if hybrid else ""))
-                
-                url = f'https://www.linkedin.com/jobs/search/?keywords={keyword}&location={location}{f_WT}&refresh=true'
+        for query in self.plano:
+            location, keyword = query['location'], query['keyword']
+            estado = sessao.estado(location, keyword)
+            if estado['concluida']: continue
+            f_WT = "&f_WT=1%2C2" if remote and hybrid else ("&f_WT=2" if remote else ("&f_WT=1" if hybrid else ""))
+
+            while not estado['concluida']:
+                pagina = estado['pagina']
+                if pagina >= self.paginas:  # config com menos páginas que o journal: a query já terminou
+                    sessao.avancar_pagina(location, keyword, fim=True)
+                    break
+                print(f"--- Buscando em: {location} | Keyword: {keyword} | Página {pagina + 1} (prioridade {query['prioridade']}) ---")
+                url = f'https://www.linkedin.com/jobs/search/?keywords={keyword}&location={location}{f_WT}&start={pagina * VAGAS_POR_PAGINA}&refresh=true'
                 self.driver.get(url)
                 
                 # Pausa extra para garantir que a página de busca carregue sem bloquear
                 time.sleep(random.uniform(5, 8))
                 
                 try:
-                    job_cards = self.driver.find_elements(By.XPATH, '//div[@data-job-id]')
-                    print(f"Encontrados {len(job_cards)} vagas.")
-                except:
+                    ids_cards = [card.get_attribute("data-job-id") for card in self.driver.find_elements(By.XPATH, '//div[@data-job-id]')]
+                    print(f"Encontrados {len(ids_cards)} vagas.")
+                except Exception as e:
+                    if erro_fatal(e): raise
                     print("Nenhuma vaga encontrada ou erro de carregamento.")
-                    continue
-
-                for card in job_cards:
-                    try:
-                        job_id = card.get_attribute("data-job-id")
-                        if job_id in job_ids_scraped: continue
-                        
-                        self.driver.execute_script("arguments[0].scrollIntoView();", card)
-                        self.driver.execute_script("arguments[0].click();", card)
-                        time.sleep(random.uniform(2, 4))
-                        
-                        try: title = self.driver.find_element(By.CLASS_NAME, 'job-details-jobs-unified-top-card__job-title').text.strip()
-                        except: title = "N/A"
-                        try: company = self.driver.find_element(By.CLASS_NAME, 'job-details-jobs-unified-top-card__company-name').text.strip()
-                        except: company = "N/A"
-                        
+                    ids_cards = []
+
+                # Rendimento da página (vagas ainda não coletadas); na retomada vale a contagem do primeiro carregamento
+                contagem = sessao.contagem_pagina(location, keyword, len(ids_cards), len(set(ids_cards) - job_ids_scraped))
+                print(f"🆕 {contagem['novas']} vagas novas nesta página.")
+
+                # Vaga que falhou não é marcada como vista nem entra no CSV: tenta de novo no fim da
+                # página e, se falhar outra vez, é coletada quando aparecer em outra busca ou sessão
+                pendentes = ids_cards
+                for tentativa in range(2):
+                    falhas = []
+                    for job_id in pendentes:
+                        if sessao.ja_visto(location, keyword, job_id): continue
+                        if job_id in job_ids_scraped:
+                            sessao.marcar_visto(location, keyword, job_id, salvo=False)
+                            continue
                         try:
-                            try:
-                                self.driver.find_element(By.CLASS_NAME, 'jobs-description__footer-button').click()
-                                time.sleep(1)
-                            except: pass
-                            desc = self.driver.find_element(By.ID, 'job-details').text
-                        except: continue
-
-                        print(f"Lendo: {title} @ {company}")
-                        prompt = get_extraction_prompt(desc)
-                        response_ia = ask_ia(prompt)
-                        data_json = clean_json_response(response_ia) or {}
-                        
-                        new_row = {
-                            "data_coleta": datetime.now().strftime("%Y-%m-%d"),
-                            "titulo": title, "empresa": company, "local": location,
-                            "link": f"https://www.linkedin.com/jobs/view/{job_id}",
-                            "tech_stack": str(data_json.get("tech_stack", [])),
-                            "educacao": data_json.get("educacao", "N/A"),
-                            "tipo": data_json.get("tipo_trabalho", "N/A"),
-                            "soft_skills": str(data_json.get("soft_skills", [])),
-                            "cloud": str(data_json.get("ferramentas_cloud", [])),
-                            "linguas": str(data_json.get("linguas", [])),
-                            "descricao_raw": desc[:] 
-                        }
-                        pd.DataFrame([new_row]).to_csv(output_file, mode='a', header=False, index=False)
-                        print("✅ Salvo!")
-                        job_ids_scraped.append(job_id)
-                    except: continue
+                            salvo = self._coletar_vaga(job_id, location, colunas_csv, output_file, armazem, indice)
+                        except Exception as e:
+                            if erro_fatal(e): raise  # Driver morto: sobe para o scrape_jobs reiniciar
+                            mensagem = str(e).strip().splitlines()[0] if str(e).strip() else ''
+                            print(f"⚠️ Erro ao coletar a vaga {job_id} ({type(e).__name__}): {mensagem}")
+                            falhas.append(job_id)
+                            continue
+                        if salvo: job_ids_scraped.add(job_id)
+                        sessao.marcar_visto(location, keyword, job_id, salvo)
+                    pendentes = falhas
+                    if not pendentes: break
+                if pendentes:
+                    print(f"⚠️ {len(pendentes)} vaga(s) desta página não coletada(s): {', '.join(pendentes)}")
+
+                # Página sem resultados = fim da busca (não adianta pedir as próximas)
+                fim = not ids_cards or pagina + 1 >= self.paginas
+                sessao.avancar_pagina(location, keyword, fim)
+
+            # Rendimento da query (vagas ainda não coletadas) alimenta a priorização do planejador
+            registrar_resultado(historico, location, keyword, estado['listadas'], estado['novas'])
+
+    def _coletar_vaga(self, job_id, location, colunas_csv, output_file, armazem, indice):
+        """Abre o card, extrai a vaga com a IA e grava em CSV/armazém/índice. Retorna True se salvou."""
+        import pandas as pd
+        from selenium.webdriver.common.by import By
+
+        # Busca o card pelo id a cada vaga (referência nova, sem StaleElementReference)
+        card = self.driver.find_element(By.XPATH, f'//div[@data-job-id="{job_id}"]')
+        self.driver.execute_script("arguments[0].scrollIntoView();", card)
+        self.driver.execute_script("arguments[0].click();", card)
+        time.sleep(random.uniform(2, 4))
+        
+        try: title = self.driver.find_element(By.CLASS_NAME, 'job-details-jobs-unified-top-card__job-title').text.strip()
+        except Exception as e:
+            if erro_fatal(e): raise
+            title = "N/A"
+        try: company = self.driver.find_element(By.CLASS_NAME, 'job-details-jobs-unified-top-card__company-name').text.strip()
+        except Exception as e:
+            if erro_fatal(e): raise
+            company = "N/A"
+        
+        try:
+            self.driver.find_element(By.CLASS_NAME, 'jobs-description__footer-button').click()
+            time.sleep(1)
+        except Exception as e:
+            if erro_fatal(e): raise
+        desc = self.driver.find_element(By.ID, 'job-details').text
+
+        print(f"Lendo: {title} @ {company}")
+        prompt = get_extraction_prompt(desc)
+        data_json = ask_ia(prompt, ExtracaoVaga)
+        
+        new_row = {
+            "data_coleta": datetime.now().strftime("%Y-%m-%d"),
+            "titulo": title, "empresa": company, "local": location,
+            "link": f"https://www.linkedin.com/jobs/view/{job_id}",
+            "tech_stack": str(data_json.get("tech_stack", [])),
+            "educacao": data_json.get("educacao", "N/A"),
+            "tipo": data_json.get("tipo_trabalho", "N/A"),
+            "soft_skills": str(data_json.get("soft_skills", [])),
+            "cloud": str(data_json.get("ferramentas_cloud", [])),
+            "linguas": str(data_json.get("linguas", [])),
+            "descricao_raw": desc[:] 
+        }
+        armazem.adicionar(int(job_id), desc)
+        pd.DataFrame([new_row]).reindex(columns=colunas_csv).to_csv(output_file, mode='a', header=False, index=False)
+        with indice: indexar_vaga(indice, int(job_id), title, desc)
+        print("✅ Salvo!")
+        return True
+
+def main(argv=None):
+    from dotenv import load_dotenv
+
+    argv = sys.argv[1:] if argv is None else argv
+    # --nova-sessao descarta o journal e ignora o progresso da execução interrompida
+    if '--nova-sessao' in argv:
+        argv = [arg for arg in argv if arg != '--nova-sessao']
+        descartar_sessao()
+    load_dotenv()
+    warnings.filterwarnings('ignore')
+
+    # Segredos (Só precisamos da API KEY agora, o login vc faz na mão)
+    if not os.getenv("GEMINI_API_KEY"):
+        print("ERRO: Faltando API Key no .env")
+        sys.exit()
+
+    config = carregar_config(f'{argv[0]}.json' if argv else 'config.json')
+
+    # Se o planejador.py já gerou um plano, roda sem perguntar nada; senão, modo interativo
+    plano = carregar_plano()
+    if plano:
+        # Re-ranqueia com o histórico atual: o que o planejador aprendeu vale já nesta execução
+        total = len(plano)
+        plano = replanejar(plano, carregar_historico())
+        print(f"\n📋 Usando {ARQUIVO_PLANO} ({len(plano)} de {total} buscas ativas pelo histórico). Apague o arquivo para voltar ao modo interativo.")
+    else:
+        try:
+            plano = montar_plano_interativo(config)
+        except KeyboardInterrupt:
+            sys.exit()
+
+    sessao = SessaoScraper(plano)
+    if sessao.retomada():
+        print(f"⏯️ Retomando sessão interrompida: {sessao.resumo()}. Use --nova-sessao para recomeçar.")
+        # A query interrompida no meio volta primeiro, mesmo que o re-ranqueamento tenha mudado a ordem
+        plano = sessao.em_andamento_primeiro(plano)
 
-if __name__ == "__main__":
     try:
-        scraper = LinkedinScraper()
-        scraper.scrape_jobs()
+        scraper = LinkedinScraper(plano, config['remote'], config['hybrid'], config['paginas'])
+        scraper.scrape_jobs(sessao)
     except Exception as e:
         print(f"Erro fatal: {e}")
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
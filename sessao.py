@@ -0,0 +1,117 @@
+import json
+import os
+from datetime import datetime
+
+from planejador import chave_query
+
+# Journal da sessão de scraping: para cada query (local x keyword) do plano guarda a página
+# em que parou, os ids de vaga já vistos e o horário do último sucesso. Se o driver ou o
+# processo cair, a próxima execução retoma da mesma query e página em vez de refazer tudo.
+# O arquivo é regravado de forma atômica a cada vaga, então um crash nunca o corrompe.
+
+ARQUIVO_SESSAO = 'sessao_scraper.json'
+# Cookies de login são credenciais: ficam fora da pasta do projeto (longe do git e do COPY . . do Docker)
+ARQUIVO_COOKIES = os.path.join(os.path.expanduser('~'), '.job-hunter', 'sessao_cookies.json')
+
+def _agora():
+    return datetime.now().isoformat(timespec='seconds')
+
+def _gravar_atomico(dados, caminho, modo=0o644):
+    temporario = f"{caminho}.tmp"
+    with open(os.open(temporario, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, modo), 'w', encoding='utf-8') as file:
+        json.dump(dados, file, ensure_ascii=False)
+    os.replace(temporario, caminho)
+
+def _ler(caminho):
+    try:
+        with open(caminho, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+class SessaoScraper:
+    """Progresso por query da sessão atual, persistido em ARQUIVO_SESSAO"""
+
+    def __init__(self, plano, caminho=ARQUIVO_SESSAO):
+        self.caminho = caminho
+        self.dados = _ler(caminho) or {}
+        self.chaves = [chave_query(query['location'], query['keyword']) for query in plano]
+        queries = self.dados.get("queries", {})
+        # Sessão anterior terminada (ou inexistente): começa do zero. Só contam as queries que
+        # ainda estão no plano (o plano é re-ranqueado a cada execução e pode perder queries)
+        if not any(chave in queries and not queries[chave]["concluida"] for chave in self.chaves):
+            self.dados = {"iniciada": _agora(), "queries": {}}
+        for chave in self.chaves:
+            self.dados["queries"].setdefault(chave, {
+                "pagina": 0, "vistos": [], "concluida": False, "ultimo_sucesso": None,
+                "listadas": 0, "novas": 0, "pagina_atual": None,
+            })
+        self._vistos = {chave: set(self.dados["queries"][chave]["vistos"]) for chave in self.chaves}
+
+    def retomada(self):
+        """True se a sessão já tinha progresso (execução anterior interrompida)"""
+        return any(estado["pagina"] or estado["vistos"] or estado["concluida"] for estado in self.dados["queries"].values())
+
+    def em_andamento_primeiro(self, plano):
+        """Plano com as queries já começadas (e não concluídas) na frente, na ordem original"""
+        def comecada(query):
+            estado = self.estado(query['location'], query['keyword'])
+            return not estado["concluida"] and bool(estado["pagina"] or estado["vistos"])
+        return sorted(plano, key=lambda query: not comecada(query))
+
+    def resumo(self):
+        concluidas = sum(self.dados["queries"][chave]["concluida"] for chave in self.chaves)
+        return f"{concluidas}/{len(self.chaves)} buscas concluídas (sessão iniciada em {self.dados['iniciada']})"
+
+    def estado(self, location, keyword):
+        return self.dados["queries"][chave_query(location, keyword)]
+
+    def ja_visto(self, location, keyword, job_id):
+        return job_id in self._vistos[chave_query(location, keyword)]
+
+    def contagem_pagina(self, location, keyword, listadas, novas):
+        """Fixa as contagens da página na primeira vez que ela é carregada (recarregar após um crash não conta de novo)"""
+        estado = self.estado(location, keyword)
+        if estado["pagina_atual"] is None:
+            estado["pagina_atual"] = {"listadas": listadas, "novas": novas}
+            self.salvar()
+        return estado["pagina_atual"]
+
+    def marcar_visto(self, location, keyword, job_id, salvo):
+        chave = chave_query(location, keyword)
+        estado = self.dados["queries"][chave]
+        if job_id not in self._vistos[chave]:
+            self._vistos[chave].add(job_id)
+            estado["vistos"].append(job_id)
+        if salvo: estado["ultimo_sucesso"] = _agora()
+        self.salvar()
+
+    def avancar_pagina(self, location, keyword, fim=False):
+        """Fecha a página atual (soma as contagens) e passa para a próxima, ou encerra a query"""
+        estado = self.estado(location, keyword)
+        if estado["pagina_atual"]:
+            estado["listadas"] += estado["pagina_atual"]["listadas"]
+            estado["novas"] += estado["pagina_atual"]["novas"]
+        estado["pagina_atual"] = None
+        estado["pagina"] += 1
+        estado["concluida"] = fim
+        estado["ultimo_sucesso"] = _agora()
+        self.salvar()
+
+    def progresso(self):
+        """Contador monotônico do trabalho feito (vagas vistas + páginas fechadas)"""
+        return sum(len(estado["vistos"]) + estado["pagina"] for estado in self.dados["queries"].values())
+
+    def salvar(self):
+        _gravar_atomico(self.dados, self.caminho)
+
+def descartar_sessao(caminho=ARQUIVO_SESSAO):
+    if os.path.isfile(caminho): os.remove(caminho)
+
+def carregar_cookies(caminho=ARQUIVO_COOKIES):
+    return _ler(caminho) or []
+
+def salvar_cookies(cookies, caminho=ARQUIVO_COOKIES):
+    """Grava os cookies legíveis só pelo dono do arquivo (0600)"""
+    os.makedirs(os.path.dirname(caminho) or '.', mode=0o700, exist_ok=True)
+    _gravar_atomico(cookies, caminho, modo=0o600)
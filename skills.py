@@ -0,0 +1,151 @@
+import ast
+
+# numpy só é importado dentro de SkillsCompactas: enrich e os workers do backfill usam apenas
+# limpar_lista/normalizar_techs e não pagam o import (~45 ms)
+
+# Mapa de EXPANSÃO (1 skill vira várias)
+# Ex: 'Azure Databricks' -> Conta como Azure e como Databricks
+MAPA_EXPANSAO = {
+    'azure databricks': ['Azure', 'Databricks'],
+    'azure sql': ['Azure', 'SQL', 'Azure SQL'],
+    'azure sql database': ['Azure', 'SQL', 'Azure SQL'],
+    'aws glue': ['AWS', 'Glue'],
+    'aws lambda': ['AWS', 'Lambda'],
+    'google bigquery': ['GCP', 'BigQuery'],
+    'bigquery': ['GCP', 'BigQuery']
+}
+
+# Mapa de SUBSTITUIÇÃO SIMPLES (Padronização)
+MAPA_SUBSTITUICAO = {
+    'data bricks': 'Databricks',
+    'powerbi': 'Power BI',
+    'microsoft power bi': 'Power BI',
+    'sql server': 'SQL',
+    'transact-sql': 'SQL',
+    't-sql': 'SQL',
+    'amazon web services': 'AWS',
+    'gcp': 'GCP',
+    'google cloud platform': 'GCP',
+    'google cloud': 'GCP',
+    'azure': 'Microsoft Azure', # Padroniza nome da cloud
+    'microsoft azure': 'Microsoft Azure',
+    'excel': 'Excel',
+    'ms excel': 'Excel'
+}
+
+def limpar_lista(item):
+    """Converte a lista salva como texto no CSV ("['Python', 'SQL']") em lista Python"""
+    try:
+        if not isinstance(item, str) or item == 'N/A' or item == '[]': return []  # NaN/None também caem aqui
+        return ast.literal_eval(item)
+    except: return []
+
+def normalizar_techs(lista_techs):
+    """Padroniza nomes de skills e expande as compostas (ex: 'AWS Glue' -> AWS + Glue)"""
+    if not isinstance(lista_techs, list): return []
+    nova_lista = []
+
+    for tech in lista_techs:
+        tech_lower = tech.strip().lower()
+
+        # 1. Verifica se deve expandir
+        if tech_lower in MAPA_EXPANSAO:
+            nova_lista.extend(MAPA_EXPANSAO[tech_lower])
+
+        # 2. Verifica se deve substituir
+        elif tech_lower in MAPA_SUBSTITUICAO:
+            nova_lista.append(MAPA_SUBSTITUICAO[tech_lower])
+
+        # 3. Mantém original se não houver regra
+        else:
+            nova_lista.append(tech)
+
+    # Remove duplicatas finais (Ex: se já tinha Azure e adicionou Azure de novo)
+    return list(set(nova_lista))
+
+class SkillsCompactas:
+    """Listas de skills de todas as vagas em formato compacto.
+
+    Cada skill distinta recebe um id inteiro num vocabulário global; as listas ficam
+    concatenadas em um único array de ids (uint16) e `offsets[i]:offsets[i+1]`
+    delimita as skills da vaga i.
+    """
+
+    def __init__(self, vocab, offsets, ids):
+        self.vocab = vocab
+        self.offsets = offsets
+        self.ids = ids
+        self._ids_por_skill = {skill: i for i, skill in enumerate(vocab)}
+        self._vaga_de_cada_id = None
+
+    @classmethod
+    def de_listas(cls, listas):
+        import numpy as np
+        ids_por_skill = {}
+        ids, offsets = [], [0]
+        for lista in listas:
+            ids.extend(ids_por_skill.setdefault(skill, len(ids_por_skill)) for skill in lista)
+            offsets.append(len(ids))
+        dtype = np.uint16 if len(ids_por_skill) <= np.iinfo(np.uint16).max + 1 else np.int32
+        return cls(list(ids_por_skill), np.asarray(offsets, dtype=np.int64), np.asarray(ids, dtype=dtype))
+
+    @classmethod
+    def de_coluna(cls, coluna, normalizar=True):
+        """Converte uma coluna no formato legado ("['Python', 'SQL']") para o formato compacto"""
+        if normalizar:
+            return cls.de_listas(normalizar_techs(limpar_lista(item)) for item in coluna)
+        return cls.de_listas(limpar_lista(item) for item in coluna)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def tamanhos(self):
+        import numpy as np
+        return np.diff(self.offsets)
+
+    def lista(self, i):
+        return [self.vocab[j] for j in self.ids[self.offsets[i]:self.offsets[i + 1]]]
+
+    def para_coluna(self):
+        """Volta para o formato legado (lista como texto), uma string por vaga"""
+        return [str(self.lista(i)) for i in range(len(self))]
+
+    def selecionar(self, linhas):
+        """Recorte com as vagas nas posições `linhas` (mesmo vocabulário, sem laço em Python)"""
+        import numpy as np
+        linhas = np.asarray(linhas, dtype=np.int64)
+        tamanhos = self.tamanhos()[linhas]
+        offsets = np.zeros(len(linhas) + 1, dtype=np.int64)
+        np.cumsum(tamanhos, out=offsets[1:])
+        # Posição de cada id no array original = início da vaga + deslocamento dentro dela
+        posicoes = np.repeat(self.offsets[:-1][linhas] - offsets[:-1], tamanhos) + np.arange(offsets[-1])
+        return SkillsCompactas(self.vocab, offsets, self.ids[posicoes])
+
+    def vaga_de_cada_id(self):
+        """Posição da vaga dona de cada id do array `ids` (calculado uma vez e reaproveitado)"""
+        import numpy as np
+        if self._vaga_de_cada_id is None:
+            self._vaga_de_cada_id = np.repeat(np.arange(len(self), dtype=np.int32), self.tamanhos())
+        return self._vaga_de_cada_id
+
+    def contar(self, linhas=None):
+        """Quantas vezes cada skill do vocabulário aparece (nas `linhas` ou em todas as vagas)"""
+        import numpy as np
+        if linhas is None:
+            ids = self.ids
+        elif len(linhas) * 8 < len(self):
+            ids = self.selecionar(linhas).ids
+        else:
+            # Recorte grande: filtrar os ids por uma máscara de vagas sai mais barato que remontar os offsets
+            marcadas = np.zeros(len(self), dtype=bool)
+            marcadas[linhas] = True
+            ids = self.ids[marcadas[self.vaga_de_cada_id()]]
+        return np.bincount(ids, minlength=len(self.vocab))
+
+    def contem(self, skill):
+        """Máscara booleana das vagas que pedem a skill"""
+        import numpy as np
+        mascara = np.zeros(len(self), dtype=bool)
+        if skill in self._ids_por_skill:
+            mascara[self.vaga_de_cada_id()[self.ids == self._ids_por_skill[skill]]] = True
+        return mascara
@@ -0,0 +1,142 @@
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from cubo import DIMENSOES
+from skills import SkillsCompactas
+
+# Séries temporais por data_coleta: um rollup por dia (vagas por cargo/senioridade/tipo,
+# contagem de skills, vagas novas x republicadas) mantido de forma incremental. O CSV é
+# append-only em ordem de coleta, então basta guardar quantas linhas já foram agregadas:
+# só os dias das linhas novas (e os dias que o enrich avisar que mudaram) são reagregados.
+# O mapa de vagas já vistas (empresa|título -> primeiro/último dia) fica num arquivo à parte,
+# lido só na atualização; o dashboard carrega apenas os rollups.
+
+ARQUIVO_TENDENCIAS = 'tendencias_vagas.json'
+ARQUIVO_VISTAS = 'tendencias_vistas.json'
+COLUNAS = ['data_coleta', 'empresa', 'titulo', 'tech_stack'] + DIMENSOES
+
+def _chave_vaga(empresa, titulo):
+    """Mesma empresa + mesmo título = mesma vaga (republicada com outro id no LinkedIn)"""
+    return f"{' '.join(str(empresa).split()).lower()}|{' '.join(str(titulo).split()).lower()}"
+
+def _agregar_dia(df_dia, dia, vistas, tech=None):
+    # Cada vaga (empresa|título) conta uma vez por dia, mesmo que apareça em várias linhas
+    chaves = set(_chave_vaga(e, t) for e, t in zip(df_dia['empresa'], df_dia['titulo']))
+    for chave in chaves:
+        primeiro, ultimo = vistas.get(chave, (dia, dia))
+        vistas[chave] = [min(primeiro, dia), max(ultimo, dia)]  # Primeiro e último dia em que a vaga apareceu
+    novas = sum(vistas[chave][0] == dia for chave in chaves)
+
+    # Com as skills já compactas (dashboard), conta direto pelos ids das linhas do dia
+    if tech is None: tech, linhas = SkillsCompactas.de_coluna(df_dia['tech_stack']), None
+    else: linhas = df_dia.index.to_numpy()
+    contagem = tech.contar(linhas)
+    return {
+        "vagas": len(df_dia),
+        "novas": novas,
+        "republicadas": len(chaves) - novas,
+        **{col: df_dia[col].fillna('N/A').astype(str).value_counts().to_dict() for col in DIMENSOES},
+        "skills": {skill: int(n) for skill, n in zip(tech.vocab, contagem) if n},
+    }
+
+def _linhas_dos_dias(df, dias):
+    """Início do bloco final do CSV com as linhas dos `dias` (appends em ordem de coleta ficam no fim)"""
+    datas = df['data_coleta'].to_numpy()
+    inicio = len(datas)
+    while inicio > 0 and (datas[inicio - 1] in dias or pd.isna(datas[inicio - 1])):
+        inicio -= 1
+    return inicio
+
+def atualizar_tendencias(df, tendencias, vistas, dias_alterados=(), tech=None):
+    """Agrega no rollup diário só os dias das linhas novas do DataFrame (e os `dias_alterados`).
+
+    `tendencias` e `vistas` são atualizados no lugar. Retorna os dias agregados. Se `tech`
+    (SkillsCompactas alinhado às linhas de `df`, com índice 0..n-1) for passado, a coluna
+    tech_stack não é necessária.
+    """
+    tendencias.pop("vistas", None)  # Formato antigo guardava as vistas junto dos rollups
+    dias = tendencias.setdefault("dias", {})
+    agregadas = tendencias.get("linhas", 0)
+    if agregadas > len(df):
+        # CSV encolheu (regravado/deduplicado): o histórico não bate mais, refaz do zero
+        dias.clear(); vistas.clear(); agregadas = 0
+
+    df = df.reindex(columns=COLUNAS)
+    tendencias["linhas"] = len(df)
+    pendentes = sorted(set(df['data_coleta'].iloc[agregadas:].dropna()) | set(dias_alterados))
+    if not pendentes: return []
+
+    if dias_alterados:
+        # Dias antigos alterados (enrich) podem estar em qualquer parte do CSV
+        df = df[df['data_coleta'].isin(pendentes)]
+    else:
+        df = df.iloc[_linhas_dos_dias(df, set(pendentes)):]
+    # Dias em ordem cronológica: "nova" = primeira vez que empresa+título aparece
+    for dia, df_dia in sorted(df.groupby('data_coleta'), key=lambda item: item[0]):
+        dias[dia] = _agregar_dia(df_dia, dia, vistas, tech)
+    return pendentes
+
+def serie(tendencias, campo, top=None):
+    """DataFrame (dia x valor) com a contagem diária de um campo do rollup (ex: 'skills', 'cargo_simplificado')"""
+    dias = tendencias.get("dias", {})
+    tabela = pd.DataFrame({dia: rollup[campo] for dia, rollup in sorted(dias.items())}).T.fillna(0).astype(int)
+    if top and not tabela.empty:
+        tabela = tabela[tabela.sum().nlargest(top).index]
+    return tabela
+
+def _ler_json(caminho):
+    try:
+        with open(caminho, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def _salvar_json(dados, caminho):
+    with open(caminho, 'w', encoding='utf-8') as file:
+        json.dump(dados, file, ensure_ascii=False)
+
+def carregar_tendencias(caminho=ARQUIVO_TENDENCIAS):
+    return _ler_json(caminho)
+
+def salvar_tendencias(tendencias, caminho=ARQUIVO_TENDENCIAS):
+    _salvar_json(tendencias, caminho)
+
+def carregar_vistas(caminho=ARQUIVO_VISTAS):
+    return _ler_json(caminho)
+
+def salvar_vistas(vistas, caminho=ARQUIVO_VISTAS):
+    _salvar_json(vistas, caminho)
+
+def tendencias_desatualizadas(arquivo_csv, caminho=ARQUIVO_TENDENCIAS):
+    return not os.path.isfile(caminho) or os.path.getmtime(caminho) < os.path.getmtime(arquivo_csv)
+
+def main():
+    args = sys.argv[1:]
+    refazer = '--refazer' in args
+    args = [arg for arg in args if arg != '--refazer']
+    # --dias 2026-01-05,2026-01-06: dias cujas linhas foram regravadas no lugar (fora do enrich/backfill)
+    dias_alterados = []
+    if '--dias' in args:
+        posicao = args.index('--dias')
+        dias_alterados = [dia for dia in args[posicao + 1].split(',') if dia]
+        del args[posicao:posicao + 2]
+    arquivo_csv = args[0] if args else 'dados_vagas_linkedin.csv'
+
+    print(f"📂 Lendo {arquivo_csv}...")
+    colunas = pd.read_csv(arquivo_csv, nrows=0).columns
+    df = pd.read_csv(arquivo_csv, usecols=[col for col in COLUNAS if col in colunas])
+
+    tendencias, vistas = ({}, {}) if refazer else (carregar_tendencias(), carregar_vistas())
+    inicio = time.perf_counter()
+    pendentes = atualizar_tendencias(df, tendencias, vistas, dias_alterados)
+    salvar_tendencias(tendencias)
+    salvar_vistas(vistas)
+    print(f"✅ {len(pendentes)} dia(s) agregado(s) em {time.perf_counter() - inicio:.2f}s "
+          f"({len(tendencias['dias'])} dias no histórico, salvo em {ARQUIVO_TENDENCIAS})")
+
+if __name__ == "__main__":
+    main()
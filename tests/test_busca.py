@@ -0,0 +1,38 @@
+import pytest
+
+from busca import _consulta_fts, abrir_indice, buscar, ids_da_busca, indexar_vaga
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("python", '"python"'),
+    ("data engineer", '"data" "engineer"'),
+    ('"engenheiro de dados" OR python', '"engenheiro de dados" OR "python"'),
+    ("c++ node.js data:engineer -java", '"c++" "node.js" "data:engineer" "-java"'),
+    ('vaga "aberta', '"vaga" "aberta"'),
+    ("engineer NOT python", '"engineer" NOT "python"'),
+    ("AND python NOT java", '"python" NOT "java"'),
+    ("OR python OR", '"python"'),
+    ("   ", ""),
+])
+def test_consulta_fts(texto, esperado):
+    assert _consulta_fts(texto) == esperado
+
+@pytest.mark.parametrize("texto", ["NOT python", "OR NOT python", "AND NOT \"machine learning\""])
+def test_not_no_comeco_e_rejeitado(texto):
+    with pytest.raises(ValueError):
+        _consulta_fts(texto)
+
+def test_busca_no_indice():
+    con = abrir_indice(':memory:')
+    indexar_vaga(con, 1, "Data Engineer", "Pipelines em Python e Spark")
+    indexar_vaga(con, 2, "Engenheiro de Dados", "SQL e Python")
+    indexar_vaga(con, 3, "Frontend Engineer", "React e TypeScript")
+    indexar_vaga(con, 4, "Analista de BI", "Trabalho junto com o time de engineer")
+    assert indexar_vaga(con, 1, "Data Engineer", "Pipelines em Python e Spark") == 0  # Id já indexado
+    # Termo no título pesa mais que na descrição
+    assert sorted(buscar(con, "engineer")[:2]) == [1, 3]
+    assert buscar(con, "engineer")[-1] == 4
+    assert sorted(ids_da_busca(con, "python")) == [1, 2]
+    assert sorted(ids_da_busca(con, "engineer NOT python")) == [3, 4]
+    assert buscar(con, '"engenheiro de dados"') == [2]
+    assert len(buscar(con, "engineer OR python", limite=2)) == 2
+    assert sorted(ids_da_busca(con, "engineer OR python")) == [1, 2, 3, 4]
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from cubo import DIMENSOES, TODOS, agregar_celula, construir_cubo, indexar_cubo
+from skills import SkillsCompactas
+
+def _vagas():
+    return pd.DataFrame({
+        "empresa": ["Acme", "Acme", "Beta", "Gama", None, "Beta"],
+        "local": ["SP", "SP", "RJ", "SP", "BH", "RJ"],
+        "cargo_simplificado": ["Data Engineer", "Data Engineer", "Analista", "Data Engineer", "Analista", None],
+        "senioridade_simplificada": ["Senior", "Pleno", "Pleno", "Senior", "Junior", "Pleno"],
+        "tipo_padronizado": ["Remoto", "Híbrido", "Remoto", "Remoto", "Presencial", "Remoto"],
+        "tech_stack": ["['Python', 'SQL']", "['Python']", "['SQL', 'Power BI']", "['Spark', 'Python']", None, "['SQL']"],
+        "cloud": ["['AWS']", None, "['Azure']", "['AWS', 'GCP']", None, None],
+    })
+
+def test_agregar_celula_igual_ao_cubo():
+    df = _vagas()
+    tech, cloud = SkillsCompactas.de_coluna(df['tech_stack']), SkillsCompactas.de_coluna(df['cloud'])
+    cubo = indexar_cubo(construir_cubo(df, tech, cloud))
+    for chave, esperada in cubo['celulas'].items():
+        linhas = np.arange(len(df))
+        for col, valor in zip(DIMENSOES, chave):
+            if valor != TODOS:
+                linhas = linhas[(df[col].iloc[linhas] == valor).to_numpy()]
+        celula = agregar_celula(df, linhas, tech, cloud)
+        assert celula == {campo: valor for campo, valor in esperada.items() if campo in celula}, chave
+
+def test_agregar_celula_vazia():
+    df = _vagas()
+    tech, cloud = SkillsCompactas.de_coluna(df['tech_stack']), SkillsCompactas.de_coluna(df['cloud'])
+    celula = agregar_celula(df, np.array([], dtype=np.int64), tech, cloud)
+    assert celula == {"vagas": 0, "empresas": 0, "moda_tipo": "N/A", "moda_local": "N/A",
+                      "moda_senioridade": "N/A", "top_tech": [], "top_cloud": []}
@@ -0,0 +1,63 @@
+import pandas as pd
+
+from descricoes import ARQUIVO_INDICE, REGISTRO, ArquivoDescricoes, migrar_csv
+
+def test_grava_e_le_por_id(tmp_path):
+    armazem = ArquivoDescricoes(tmp_path)
+    assert armazem.adicionar(1, "Vaga de Python e SQL")
+    assert armazem.adicionar(2, "Engenheiro de dados com Spark")
+    assert not armazem.adicionar(1, "outra descrição")  # Id já armazenado
+    assert armazem.ler(1) == "Vaga de Python e SQL"
+    assert armazem.ler(3) is None
+    armazem.fechar()
+
+    reaberto = ArquivoDescricoes(tmp_path)
+    assert len(reaberto) == 2 and 2 in reaberto
+    assert reaberto.ler(2) == "Engenheiro de dados com Spark"
+    reaberto.fechar()
+
+def test_remapeia_depois_de_novas_gravacoes(tmp_path):
+    armazem = ArquivoDescricoes(tmp_path)
+    armazem.adicionar(1, "primeira")
+    assert armazem.ler(1) == "primeira"  # mmap aberto com só um blob
+    armazem.adicionar(2, "segunda " * 100)
+    assert armazem.ler(2) == "segunda " * 100
+    assert armazem.ler(1) == "primeira"
+    armazem.fechar()
+
+def test_registro_incompleto_e_cortado_na_proxima_gravacao(tmp_path):
+    armazem = ArquivoDescricoes(tmp_path)
+    armazem.adicionar(1, "um")
+    armazem.adicionar(2, "dois")
+    armazem.fechar()
+    # Escrita interrompida no meio de um registro do índice
+    with open(tmp_path / ARQUIVO_INDICE, 'ab') as file:
+        file.write(REGISTRO.pack(3, 999, 10)[:7])
+
+    armazem = ArquivoDescricoes(tmp_path)
+    assert sorted(armazem.indice) == [1, 2]
+    armazem.adicionar(4, "quatro")
+    armazem.adicionar(5, "cinco")
+    armazem.fechar()
+
+    reaberto = ArquivoDescricoes(tmp_path)
+    assert (tmp_path / ARQUIVO_INDICE).stat().st_size == 4 * REGISTRO.size
+    assert [reaberto.ler(job_id) for job_id in (1, 2, 4, 5)] == ["um", "dois", "quatro", "cinco"]
+    reaberto.fechar()
+
+def test_migrar_csv_ida_e_volta(tmp_path):
+    csv = tmp_path / "vagas.csv"
+    pd.DataFrame({
+        "titulo": ["Data Engineer", "Analista", "Dev"],
+        "link": ["https://www.linkedin.com/jobs/view/101/", "https://www.linkedin.com/jobs/view/102/", "sem-id"],
+        "descricao_raw": ["Python e Spark", None, "React"],
+    }).to_csv(csv, index=False)
+
+    migrar_csv(csv, tmp_path)
+
+    df = pd.read_csv(csv)
+    assert list(df.columns) == ["titulo", "link"] and len(df) == 3
+    armazem = ArquivoDescricoes(tmp_path)
+    assert len(armazem) == 1
+    assert armazem.ler(101) == "Python e Spark"
+    armazem.fechar()
@@ -0,0 +1,53 @@
+import pytest
+
+import llm_json
+from llm_json import ExtracaoTitulo, ExtracaoDescricao, ExtracaoVaga, Keywords, json_generation_config, parse_llm_json
+
+@pytest.fixture(autouse=True)
+def contadores_zerados():
+    llm_json.falhas_por_campo.clear()
+    yield
+    llm_json.falhas_por_campo.clear()
+
+def test_json_puro_valido():
+    resultado = parse_llm_json('{"cargo_simplificado": "Data Engineer", "senioridade_simplificada": "Senior"}', ExtracaoTitulo)
+    assert resultado == {"cargo_simplificado": "Data Engineer", "senioridade_simplificada": "Senior"}
+    assert not llm_json.falhas_por_campo
+
+def test_json_com_cerca_e_texto_em_volta():
+    texto = 'Claro! ```json\n{"cargo_simplificado": "Analista", "senioridade_simplificada": "Pleno"}\n``` Espero ter ajudado {}'
+    assert parse_llm_json(texto, ExtracaoTitulo) == {"cargo_simplificado": "Analista", "senioridade_simplificada": "Pleno"}
+
+def test_json_truncado_salva_campos_completos():
+    # Resposta cortada no meio da última lista: os campos anteriores são aproveitados
+    texto = '{"tipo_padronizado": "Remoto", "tech_stack": ["Python", "SQL"], "cloud": ["AWS", "GC'
+    resultado = parse_llm_json(texto, ExtracaoDescricao)
+    assert resultado == {"tipo_padronizado": "Remoto", "tech_stack": ["Python", "SQL"]}
+    assert llm_json.falhas_por_campo["ExtracaoDescricao.cloud"] == 1
+    assert llm_json.falhas_por_campo["ExtracaoDescricao.soft_skills"] == 1
+    assert "ExtracaoDescricao.tech_stack" not in llm_json.falhas_por_campo
+    assert "ExtracaoDescricao.<json_invalido>" not in llm_json.falhas_por_campo
+
+def test_tipos_convertidos_e_invalidos_contabilizados():
+    texto = '{"tipo_padronizado": 3, "tech_stack": "Python", "cloud": {"aws": true}, "soft_skills": ["", " Comunicação "], "educacao": "  ", "linguas": null}'
+    resultado = parse_llm_json(texto, ExtracaoDescricao)
+    assert resultado == {"tipo_padronizado": "3", "tech_stack": ["Python"], "soft_skills": ["Comunicação"]}
+    assert {campo: n for campo, n in llm_json.falhas_por_campo.items()} == {
+        "ExtracaoDescricao.cloud": 1, "ExtracaoDescricao.educacao": 1, "ExtracaoDescricao.linguas": 1,
+    }
+
+def test_resposta_vazia_ou_sem_json():
+    assert parse_llm_json("", ExtracaoTitulo) == {}
+    assert parse_llm_json("não sei responder", ExtracaoTitulo) == {}
+    assert llm_json.falhas_por_campo["ExtracaoTitulo.<vazio>"] == 1
+    assert llm_json.falhas_por_campo["ExtracaoTitulo.<json_invalido>"] == 1
+    # Sem JSON aproveitável, cada campo do schema também conta como falha
+    assert llm_json.falhas_por_campo["ExtracaoTitulo.cargo_simplificado"] == 1
+
+@pytest.mark.parametrize("schema", [ExtracaoTitulo, ExtracaoDescricao, ExtracaoVaga, Keywords])
+def test_schemas_aceitos_pelo_sdk(schema):
+    # O SDK converte o response_schema com pydantic antes de qualquer chamada de rede
+    generation_types = pytest.importorskip("google.generativeai.types.generation_types")
+    config = generation_types.to_generation_config_dict(json_generation_config(schema, temperature=0.0))
+    assert config["response_mime_type"] == "application/json"
+    assert set(config["response_schema"].properties) == set(schema.__annotations__)
@@ -0,0 +1,71 @@
+import pytest
+
+from sessao import SessaoScraper
+
+PLANO = [{"location": "Brasil", "keyword": "data engineer"}, {"location": "Brasil", "keyword": "analista de dados"}]
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "sessao.json")
+
+def test_sessao_nova_sem_progresso(caminho):
+    sessao = SessaoScraper(PLANO, caminho)
+    assert not sessao.retomada()
+    assert sessao.resumo().startswith("0/2 buscas concluídas")
+
+def test_retoma_da_mesma_pagina_e_vagas(caminho):
+    sessao = SessaoScraper(PLANO, caminho)
+    sessao.contagem_pagina("Brasil", "data engineer", listadas=25, novas=10)
+    sessao.marcar_visto("Brasil", "data engineer", "111", salvo=True)
+    sessao.avancar_pagina("Brasil", "data engineer")
+    sessao.marcar_visto("Brasil", "data engineer", "222", salvo=False)
+
+    # Processo caiu: a próxima execução lê o journal
+    retomada = SessaoScraper(PLANO, caminho)
+    assert retomada.retomada()
+    assert retomada.estado("Brasil", "data engineer")["pagina"] == 1
+    assert retomada.ja_visto("Brasil", "data engineer", "111")
+    assert retomada.ja_visto("Brasil", "data engineer", "222")
+    assert not retomada.ja_visto("Brasil", "analista de dados", "111")
+
+def test_recarregar_pagina_nao_conta_de_novo(caminho):
+    sessao = SessaoScraper(PLANO, caminho)
+    assert sessao.contagem_pagina("Brasil", "data engineer", 25, 10) == {"listadas": 25, "novas": 10}
+    # Crash e retomada no meio da página: as vagas já salvas não são mais "novas"
+    retomada = SessaoScraper(PLANO, caminho)
+    assert retomada.contagem_pagina("Brasil", "data engineer", 25, 4) == {"listadas": 25, "novas": 10}
+    retomada.avancar_pagina("Brasil", "data engineer")
+    retomada.contagem_pagina("Brasil", "data engineer", 25, 3)
+    retomada.avancar_pagina("Brasil", "data engineer", fim=True)
+    estado = retomada.estado("Brasil", "data engineer")
+    assert (estado["listadas"], estado["novas"], estado["pagina"], estado["concluida"]) == (50, 13, 2, True)
+
+def test_marcar_visto_duas_vezes_nao_duplica(caminho):
+    sessao = SessaoScraper(PLANO, caminho)
+    antes = sessao.progresso()
+    sessao.marcar_visto("Brasil", "data engineer", "111", salvo=True)
+    sessao.marcar_visto("Brasil", "data engineer", "111", salvo=True)
+    assert sessao.estado("Brasil", "data engineer")["vistos"] == ["111"]
+    assert sessao.progresso() == antes + 1
+
+def test_em_andamento_primeiro(caminho):
+    sessao = SessaoScraper(PLANO, caminho)
+    sessao.marcar_visto("Brasil", "analista de dados", "111", salvo=True)
+    assert [q["keyword"] for q in sessao.em_andamento_primeiro(PLANO)] == ["analista de dados", "data engineer"]
+
+def test_sessao_concluida_recomeca(caminho):
+    sessao = SessaoScraper(PLANO, caminho)
+    for query in PLANO:
+        sessao.marcar_visto(query["location"], query["keyword"], "111", salvo=True)
+        sessao.avancar_pagina(query["location"], query["keyword"], fim=True)
+    nova = SessaoScraper(PLANO, caminho)
+    assert not nova.retomada()
+    assert not nova.ja_visto("Brasil", "data engineer", "111")
+
+def test_query_fora_do_plano_nao_segura_sessao(caminho):
+    # Só a query que saiu do plano (re-ranqueado) ficou pela metade: a sessão do plano atual terminou
+    sessao = SessaoScraper(PLANO, caminho)
+    sessao.marcar_visto("Brasil", "analista de dados", "111", salvo=True)
+    sessao.avancar_pagina("Brasil", "data engineer", fim=True)
+    nova = SessaoScraper(PLANO[:1], caminho)
+    assert not nova.retomada()
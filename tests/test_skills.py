@@ -0,0 +1,56 @@
+import random
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from skills import SkillsCompactas
+
+VOCAB = ["Python", "SQL", "Spark", "AWS", "Docker", "Power BI", "Java", "Airflow"]
+
+@pytest.fixture
+def listas():
+    aleatorio = random.Random(42)
+    # Inclui vagas sem nenhuma skill (listas vazias no começo, no meio e no fim)
+    return [[], *(aleatorio.sample(VOCAB, aleatorio.randint(0, 5)) for _ in range(300)), []]
+
+def test_lista_e_para_coluna(listas):
+    skills = SkillsCompactas.de_listas(listas)
+    assert len(skills) == len(listas)
+    assert [skills.lista(i) for i in range(len(listas))] == listas
+    assert skills.para_coluna()[1] == str(listas[1])
+
+@pytest.mark.parametrize("quantas", [0, 1, 10, 150, 302])
+def test_selecionar_e_contar(listas, quantas):
+    skills = SkillsCompactas.de_listas(listas)
+    linhas = np.array(sorted(random.Random(quantas).sample(range(len(listas)), quantas)), dtype=np.int64)
+    recorte = skills.selecionar(linhas)
+    assert [recorte.lista(i) for i in range(len(linhas))] == [listas[i] for i in linhas]
+    # Recortes pequenos e grandes usam caminhos diferentes em `contar`
+    esperado = Counter(skill for i in linhas for skill in listas[i])
+    assert dict(zip(skills.vocab, skills.contar(linhas).tolist())) == {skill: esperado[skill] for skill in skills.vocab}
+
+def test_contar_tudo(listas):
+    skills = SkillsCompactas.de_listas(listas)
+    esperado = Counter(skill for lista in listas for skill in lista)
+    assert dict(zip(skills.vocab, skills.contar().tolist())) == dict(esperado)
+
+def test_contem(listas):
+    skills = SkillsCompactas.de_listas(listas)
+    for skill in VOCAB:
+        assert skills.contem(skill).tolist() == [skill in lista for lista in listas]
+    assert not skills.contem("Cobol").any()
+
+def test_de_coluna_formato_legado():
+    skills = SkillsCompactas.de_coluna(["['Python', 'SQL']", None, "[]"], normalizar=False)
+    assert [skills.lista(i) for i in range(3)] == [["Python", "SQL"], [], []]
+
+def test_importar_sem_numpy():
+    # enrich e os workers do backfill só usam limpar_lista/normalizar_techs
+    codigo = "import sys, enrich, backfill; print('numpy' in sys.modules, 'pandas' in sys.modules)"
+    saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True,
+                           cwd=Path(__file__).resolve().parents[1]).stdout
+    assert saida.split() == ["False", "False"]
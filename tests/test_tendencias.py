@@ -0,0 +1,40 @@
+import pandas as pd
+
+from tendencias import atualizar_tendencias
+
+def _vagas():
+    return pd.DataFrame({
+        "data_coleta": ["2026-01-04", "2026-01-04", "2026-01-04", "2026-01-05", "2026-01-05"],
+        "empresa": ["Acme", "Acme", "Beta", "Acme", "Gama"],
+        "titulo": ["Data Engineer", "Data  engineer", "Analista", "Data Engineer", "Dev"],
+        "tech_stack": ["['Python']", "['Python']", "['SQL']", "['Python', 'SQL']", None],
+        "cargo_simplificado": ["Data Engineer", "Data Engineer", "Analista", "Data Engineer", None],
+        "senioridade_simplificada": ["Senior"] * 5,
+        "tipo_padronizado": ["Remoto"] * 5,
+    })
+
+def test_vaga_conta_uma_vez_por_dia_e_republicada_no_dia_seguinte():
+    tendencias, vistas = {}, {}
+    assert atualizar_tendencias(_vagas(), tendencias, vistas) == ["2026-01-04", "2026-01-05"]
+    dia1, dia2 = tendencias["dias"]["2026-01-04"], tendencias["dias"]["2026-01-05"]
+    assert (dia1["vagas"], dia1["novas"], dia1["republicadas"]) == (3, 2, 0)
+    assert (dia2["vagas"], dia2["novas"], dia2["republicadas"]) == (2, 1, 1)
+    assert dia2["skills"] == {"Python": 1, "SQL": 1}
+
+def test_so_linhas_novas_sao_agregadas():
+    df = _vagas()
+    tendencias, vistas = {}, {}
+    atualizar_tendencias(df.iloc[:3], tendencias, vistas)
+    assert atualizar_tendencias(df, tendencias, vistas) == ["2026-01-05"]
+    assert atualizar_tendencias(df, tendencias, vistas) == []
+
+def test_linhas_regravadas_so_com_dias_alterados():
+    df = _vagas()
+    tendencias, vistas = {}, {}
+    atualizar_tendencias(df, tendencias, vistas)
+    df.loc[df["data_coleta"] == "2026-01-04", "cargo_simplificado"] = "Analytics Engineer"
+    # Mesmo número de linhas: sem os dias alterados a mudança não aparece
+    assert atualizar_tendencias(df, tendencias, vistas) == []
+    assert atualizar_tendencias(df, tendencias, vistas, {"2026-01-04"}) == ["2026-01-04"]
+    assert tendencias["dias"]["2026-01-04"]["cargo_simplificado"] == {"Analytics Engineer": 3}
+    assert tendencias["dias"]["2026-01-04"]["novas"] == 2